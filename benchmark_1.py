@@ -0,0 +1,352 @@
+import argparse
+import array
+import hashlib
+import random
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Iterator, Optional
+
+from problem_1 import (ARC_Cache, Compact_CLOCK_Cache, FIFO_Cache, LRU_Cache, Sharded_LRU_Cache,
+                       TinyLFU_Cache, TwoQ_Cache)
+
+
+class Locked_LRU_Cache:
+    """
+    The baseline we are replacing: a plain LRU_Cache serialized behind one global lock.
+
+    Attributes:
+    -----------
+    cache : LRU_Cache
+        The wrapped cache.
+    lock : threading.Lock
+        The single lock every operation has to take.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.cache = LRU_Cache(capacity)
+        self.lock = threading.Lock()
+
+    def get(self, key: int) -> Optional[Any]:
+        with self.lock:
+            return self.cache.get(key)
+
+    def set(self, key: int, value: Any) -> None:
+        with self.lock:
+            self.cache.set(key, value)
+
+
+def run_contention(cache: Any, num_threads: int, ops_per_thread: int, key_space: int) -> float:
+    """
+    Hammer the cache from several threads with a 80/20 get/set mix.
+
+    Parameters:
+    -----------
+    cache : Any
+        Any object with the LRU_Cache get/set contract.
+    num_threads : int
+        The number of concurrent worker threads.
+    ops_per_thread : int
+        The number of operations each thread performs.
+    key_space : int
+        Keys are drawn uniformly from range(key_space).
+
+    Returns:
+    --------
+    float
+        The aggregate throughput in operations per second.
+    """
+    barrier = threading.Barrier(num_threads + 1)
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        keys = [rng.randrange(key_space) for _ in range(ops_per_thread)]
+        barrier.wait()
+        for i, key in enumerate(keys):
+            if i % 5 == 0:
+                cache.set(key, key)
+            else:
+                cache.get(key)
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(num_threads)]
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()  # Release all workers at once
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return num_threads * ops_per_thread / elapsed
+
+
+def benchmark_contention(capacity: int = 10_000, ops_per_thread: int = 50_000, repeat: int = 3) -> None:
+    """
+    Compare one globally locked LRU_Cache with Sharded_LRU_Cache at increasing thread counts.
+
+    Both caches run alternately and the best of repeat runs is kept, because single runs
+    vary a lot with thread scheduling.
+    """
+    print(f"Contention benchmark (ops/sec, 80% get / 20% set, best of {repeat})")
+    print(f"{'threads':>8} {'global lock':>14} {'sharded':>14} {'speedup':>8}")
+    for num_threads in (1, 2, 4, 8, 16, 32):
+        baseline = sharded = 0.0
+        for _ in range(repeat):
+            baseline = max(baseline, run_contention(Locked_LRU_Cache(capacity), num_threads, ops_per_thread,
+                                                    capacity * 2))
+            sharded = max(sharded, run_contention(Sharded_LRU_Cache(capacity), num_threads, ops_per_thread,
+                                                  capacity * 2))
+        print(f"{num_threads:>8} {baseline:>14,.0f} {sharded:>14,.0f} {sharded / baseline:>7.2f}x")
+
+
+def zipf_trace(length: int, key_space: int, skew: float = 1.0, seed: int = 0) -> list[int]:
+    """
+    Generate a trace where key k is drawn with probability proportional to 1 / (k + 1) ** skew.
+    """
+    rng = random.Random(seed)
+    weights = [1 / (k + 1) ** skew for k in range(key_space)]
+    return rng.choices(range(key_space), weights=weights, k=length)
+
+
+def scan_trace(length: int, hot_keys: int, scan_length: int, seed: int = 0) -> list[int]:
+    """
+    Generate a trace alternating between a hot working set and scans of never repeated keys.
+    """
+    rng = random.Random(seed)
+    trace = []
+    next_cold_key = hot_keys
+    while len(trace) < length:
+        trace.extend(rng.randrange(hot_keys) for _ in range(scan_length))
+        trace.extend(range(next_cold_key, next_cold_key + scan_length))
+        next_cold_key += scan_length
+    return trace[:length]
+
+
+def hit_ratio(cache: Any, trace: list[int]) -> float:
+    """
+    Replay a trace with read-through semantics (set on miss) and return the hit ratio.
+    """
+    hits = 0
+    for key in trace:
+        if cache.get(key) == -1:
+            cache.set(key, key)
+        else:
+            hits += 1
+    return hits / len(trace)
+
+
+def benchmark_hit_ratio(capacity: int = 1_000) -> None:
+    """
+    Compare the hit ratio of LRU_Cache and TinyLFU_Cache on skewed and scan-heavy traces.
+    """
+    traces = {
+        "zipf 0.8": zipf_trace(200_000, 50_000, skew=0.8),
+        "zipf 1.0": zipf_trace(200_000, 50_000, skew=1.0),
+        "hot set + scans": scan_trace(200_000, capacity // 2, capacity * 2),
+    }
+    print(f"Hit ratio benchmark (capacity {capacity:,})")
+    print(f"{'trace':>16} {'LRU':>8} {'TinyLFU':>8}")
+    for name, trace in traces.items():
+        lru = hit_ratio(LRU_Cache(capacity), trace)
+        tinylfu = hit_ratio(TinyLFU_Cache(capacity), trace)
+        print(f"{name:>16} {lru:>8.2%} {tinylfu:>8.2%}")
+
+
+def bytes_per_entry(cache_class: type, num_entries: int) -> float:
+    """
+    Measure the memory allocated per entry by a full cache, excluding the values themselves.
+    """
+    value = object()    # One shared value, so only the cache's own overhead is measured
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    cache = cache_class(num_entries)
+    for key in range(num_entries):
+        cache.set(1_000_000_000 + key, value)   # Large keys, boxed ints are not cached by CPython
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del cache
+    return allocated / num_entries
+
+
+def ops_per_second(cache: Any, keys: list[int]) -> float:
+    """
+    Replay keys with read-through semantics and return the operations per second.
+    """
+    start = time.perf_counter()
+    for key in keys:
+        if cache.get(key) == -1:
+            cache.set(key, key)
+    return len(keys) / (time.perf_counter() - start)
+
+
+def benchmark_compact(num_entries: int = 1_000_000) -> None:
+    """
+    Compare the memory footprint and speed of LRU_Cache and Compact_CLOCK_Cache.
+    """
+    keys = zipf_trace(num_entries, num_entries * 2, skew=0.8)
+    print(f"Compact cache benchmark ({num_entries:,} entries)")
+    print(f"{'cache':>20} {'bytes/entry':>12} {'ops/sec':>12}")
+    for cache_class in (LRU_Cache, Compact_CLOCK_Cache):
+        size = bytes_per_entry(cache_class, num_entries)
+        speed = ops_per_second(cache_class(num_entries // 10), keys)
+        print(f"{cache_class.__name__:>20} {size:>12.1f} {speed:>12,.0f}")
+
+
+POLICIES: dict[str, Callable[[int], Any]] = {
+    "LRU": LRU_Cache,
+    "FIFO": FIFO_Cache,
+    "CLOCK": Compact_CLOCK_Cache,
+    "2Q": TwoQ_Cache,
+    "ARC": ARC_Cache,
+    "TinyLFU": TinyLFU_Cache,
+}
+
+
+def _parse_key(line: bytes) -> int:
+    """
+    Turn one line of a text trace into an int key; non-numeric keys are hashed to 63 bits.
+    """
+    try:
+        return int(line)
+    except ValueError:
+        return int.from_bytes(hashlib.blake2b(line, digest_size=8).digest(), "little") >> 1
+
+
+def iter_trace_chunks(path: str, trace_format: str = "text", chunk_size: int = 65536) -> Iterator[list[int]]:
+    """
+    Stream a trace file in chunks of keys, without loading the whole file into memory.
+
+    Parameters:
+    -----------
+    path : str
+        The trace file.
+    trace_format : str
+        "text" for one key per line, "int32" or "int64" for a native-endian binary int array.
+    chunk_size : int
+        The number of keys per chunk.
+
+    Returns:
+    --------
+    Iterator[list[int]]
+        The keys of the trace, chunk by chunk.
+    """
+    if trace_format == "text":
+        with open(path, "rb") as trace:
+            chunk = []
+            for line in trace:
+                line = line.strip()
+                if line:
+                    chunk.append(_parse_key(line))
+                    if len(chunk) == chunk_size:
+                        yield chunk
+                        chunk = []
+            if chunk:
+                yield chunk
+        return
+
+    typecode = {"int32": "i", "int64": "q"}[trace_format]
+    with open(path, "rb") as trace:
+        while True:
+            keys = array.array(typecode)
+            try:
+                keys.fromfile(trace, chunk_size)
+            except EOFError:
+                pass    # fromfile still keeps the items read before the end of the file
+            if not keys:
+                return
+            yield keys.tolist()
+
+
+def replay(cache: Any, chunks: Iterator[list[int]]) -> tuple[int, int, int]:
+    """
+    Replay a trace with read-through semantics (set on miss).
+
+    Returns:
+    --------
+    tuple[int, int, int]
+        The number of requests, the number of hits and the time spent in the cache in ns.
+    """
+    requests = hits = elapsed = 0
+    for chunk in chunks:
+        chunk_hits = 0
+        start = time.perf_counter_ns()
+        for key in chunk:
+            if cache.get(key) == -1:
+                cache.set(key, key)
+            else:
+                chunk_hits += 1
+        elapsed += time.perf_counter_ns() - start
+        requests += len(chunk)
+        hits += chunk_hits
+    return requests, hits, elapsed
+
+
+def _peak_bytes(function: Callable[[], Any]) -> int:
+    """
+    Run a function under tracemalloc and return the peak memory it allocated.
+    """
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def benchmark_trace(path: str, trace_format: str, capacities: list[int], policies: list[str],
+                    measure_memory: bool = False) -> list[dict[str, Any]]:
+    """
+    Replay a trace file against every policy at every capacity and print the hit-ratio curves.
+
+    Each (policy, capacity) pair streams the file again, so memory stays bounded by the
+    caches themselves. With measure_memory, an extra pass under tracemalloc records the
+    peak memory, minus the peak of streaming the trace alone; it is kept separate because
+    tracing slows every allocation down.
+
+    Returns:
+    --------
+    list[dict[str, Any]]
+        One result row per (policy, capacity) pair.
+    """
+    print(f"Trace replay: {path}")
+    print(f"{'policy':>8} {'capacity':>12} {'hit ratio':>10} {'ns/op':>8} {'peak KiB':>10}")
+    results = []
+    baseline = 0
+    if measure_memory:
+        baseline = _peak_bytes(lambda: sum(1 for _ in iter_trace_chunks(path, trace_format)))
+    for name in policies:
+        for capacity in capacities:
+            requests, hits, elapsed = replay(POLICIES[name](capacity), iter_trace_chunks(path, trace_format))
+            row = {"policy": name, "capacity": capacity, "requests": requests,
+                   "hit_ratio": hits / requests if requests else 0.0,
+                   "ns_per_op": elapsed / requests if requests else 0.0, "peak_bytes": None}
+
+            if measure_memory:
+                row["peak_bytes"] = _peak_bytes(
+                    lambda: replay(POLICIES[name](capacity), iter_trace_chunks(path, trace_format))) - baseline
+
+            peak = f"{row['peak_bytes'] / 1024:,.0f}" if row["peak_bytes"] is not None else "-"
+            print(f"{name:>8} {capacity:>12,} {row['hit_ratio']:>10.2%} {row['ns_per_op']:>8,.0f} {peak:>10}")
+            results.append(row)
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmarks for the problem_1 caches.")
+    parser.add_argument("trace", nargs="?", help="replay this trace file instead of the synthetic benchmarks")
+    parser.add_argument("--format", choices=("text", "int32", "int64"), default="text",
+                        help="trace format: one key per line, or a binary int array (default text)")
+    parser.add_argument("--capacities", default="100,1000,10000,100000",
+                        help="comma-separated cache capacities to sweep")
+    parser.add_argument("--policies", default=",".join(POLICIES),
+                        help=f"comma-separated policies among {', '.join(POLICIES)}")
+    parser.add_argument("--memory", action="store_true", help="also measure peak memory (extra pass per run)")
+    args = parser.parse_args()
+
+    if args.trace:
+        benchmark_trace(args.trace, args.format, [int(c) for c in args.capacities.split(",")],
+                        args.policies.split(","), args.memory)
+    else:
+        benchmark_contention()
+        benchmark_hit_ratio()
+        benchmark_compact()
@@ -0,0 +1,281 @@
+import argparse
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable, Iterator, Optional
+
+import problem_2
+from problem_2 import FileIndex, find_files, find_files_multi, iter_files
+
+
+def find_files_listdir(suffix: str, path: str) -> list[str]:
+    """
+    The original find_files implementation (os.listdir plus isfile/isdir per entry),
+    kept as the baseline for the benchmarks.
+    """
+    result = []
+    stack = [path]
+
+    while stack:
+        current_path = stack.pop()
+        for item in os.listdir(current_path):
+            full_path = os.path.join(current_path, item)
+            if os.path.isfile(full_path) and (full_path.endswith(suffix) or suffix == ".*"):
+                result.append(full_path)
+            elif os.path.isdir(full_path):
+                stack.append(full_path)
+
+    return sorted(result)
+
+
+def generate_tree(root: str, depth: int, fan_out: int, files_per_dir: int,
+                  suffixes: Optional[dict[str, float]] = None, jitter: float = 0.0, seed: int = 0) -> int:
+    """
+    Build a reproducible synthetic directory tree of empty files under an existing root.
+
+    Parameters:
+    -----------
+    root : str
+        The existing directory to fill.
+    depth : int
+        The number of directory levels below root.
+    fan_out : int
+        The number of subdirectories per directory.
+    files_per_dir : int
+        The number of files per directory.
+    suffixes : Optional[dict[str, float]]
+        Suffix -> relative weight of the file suffixes (default: as many ".c" as ".h").
+    jitter : float
+        The relative random variation of fan_out and files_per_dir per directory,
+        e.g. 0.5 for +/-50% (default 0.0, a balanced tree).
+    seed : int
+        The random seed; the same arguments always build the same tree (default 0).
+
+    Returns:
+    --------
+    int
+        The number of files created.
+    """
+    suffixes = suffixes or {".c": 1.0, ".h": 1.0}
+    names, weights = list(suffixes), list(suffixes.values())
+    rng = random.Random(seed)
+
+    def vary(count: int) -> int:
+        return max(0, round(count * (1 + rng.uniform(-jitter, jitter)))) if jitter else count
+
+    created = 0
+    stack = [(root, depth)]
+    while stack:
+        directory, levels_left = stack.pop()
+        for i, suffix in enumerate(rng.choices(names, weights, k=vary(files_per_dir))):
+            open(os.path.join(directory, f"file{i}{suffix}"), "w").close()
+            created += 1
+        if levels_left > 0:
+            for i in range(vary(fan_out)):
+                subdir = os.path.join(directory, f"dir{i}")
+                os.mkdir(subdir)
+                stack.append((subdir, levels_left - 1))
+    return created
+
+
+def best_time(function: Callable[[], object], repeat: int = 5) -> float:
+    """
+    Return the best wall-clock time of several runs, to reduce the noise of other processes.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def benchmark_scandir(depth: int = 4, fan_out: int = 6, files_per_dir: int = 20) -> None:
+    """
+    Compare the os.listdir baseline with the os.scandir based find_files on a synthetic tree.
+    """
+    with tempfile.TemporaryDirectory() as root:
+        generate_tree(root, depth, fan_out, files_per_dir)
+        assert find_files(".c", root) == find_files_listdir(".c", root)
+        num_files = sum(len(files) for _, _, files in os.walk(root))
+
+        print(f"find_files benchmark ({num_files:,} files)")
+        for name, function in (("listdir", find_files_listdir), ("scandir", find_files)):
+            elapsed = best_time(lambda: function(".c", root))
+            print(f"{name:>10} {elapsed * 1000:>10.1f} ms {num_files / elapsed:>14,.0f} files/sec")
+
+
+@contextlib.contextmanager
+def simulated_latency(seconds: float) -> Iterator[None]:
+    """
+    Add a fixed delay to every directory listing of problem_2, to mimic a high-latency
+    filesystem such as NFS on a local disk.
+    """
+    scan_directory = problem_2._scan_directory
+
+    def slow_scan_directory(*args: Any) -> tuple[list[str], list[tuple[str, tuple[int, int]]]]:
+        time.sleep(seconds)
+        return scan_directory(*args)
+
+    problem_2._scan_directory = slow_scan_directory
+    try:
+        yield
+    finally:
+        problem_2._scan_directory = scan_directory
+
+
+def benchmark_parallel(latency: float = 0.002, depth: int = 3, fan_out: int = 6, files_per_dir: int = 20) -> None:
+    """
+    Measure find_files throughput for increasing worker counts, with a simulated listing latency.
+    """
+    with tempfile.TemporaryDirectory() as root:
+        generate_tree(root, depth, fan_out, files_per_dir)
+        expected = find_files(".c", root)
+        num_dirs = sum(1 for _ in os.walk(root))
+
+        print(f"Parallel find_files benchmark ({num_dirs:,} directories, {latency * 1000:.1f} ms per listing)")
+        with simulated_latency(latency):
+            for workers in (1, 2, 4, 8, 16, 32):
+                assert find_files(".c", root, workers=workers) == expected
+                elapsed = best_time(lambda: find_files(".c", root, workers=workers), repeat=3)
+                print(f"{workers:>4} workers {elapsed * 1000:>10.1f} ms {num_dirs / elapsed:>10,.0f} dirs/sec")
+
+
+def benchmark_index(depth: int = 4, fan_out: int = 6, files_per_dir: int = 20) -> None:
+    """
+    Compare a cold walk with warm queries answered from a persistent FileIndex.
+    """
+    with tempfile.TemporaryDirectory() as root:
+        tree = os.path.join(root, "tree")
+        os.mkdir(tree)
+        generate_tree(tree, depth, fan_out, files_per_dir)
+        for directory, _, _ in os.walk(tree):   # Old mtimes, as on a tree that is not being edited
+            os.utime(directory, ns=(0, 10**18))
+        index_path = os.path.join(root, "files.idx")
+        find_files(".c", tree, index_path=index_path)
+        index = FileIndex.load(index_path, tree)
+
+        print(f"FileIndex benchmark ({os.path.getsize(index_path):,} byte index)")
+        for name, function in (("cold walk", lambda: find_files(".c", tree)),
+                               ("load + refresh", lambda: find_files(".c", tree, index_path=index_path)),
+                               ("in memory", lambda: index.find_files(".c"))):
+            elapsed = best_time(function)
+            print(f"{name:>16} {elapsed * 1000:>10.1f} ms")
+
+
+def benchmark_multi(depth: int = 4, fan_out: int = 6, files_per_dir: int = 20) -> None:
+    """
+    Compare one find_files walk per pattern with a single find_files_multi traversal.
+    """
+    patterns = [".c", ".h", "1.c", "2.h", "file1*", "*0.c", ".o", ".txt"]
+    with tempfile.TemporaryDirectory() as root:
+        generate_tree(root, depth, fan_out, files_per_dir)
+        print(f"Multi-pattern benchmark ({len(patterns)} patterns)")
+        for name, function in (("one walk each", lambda: [find_files_multi([pattern], root) for pattern in patterns]),
+                               ("single pass", lambda: find_files_multi(patterns, root))):
+            elapsed = best_time(function)
+            print(f"{name:>16} {elapsed * 1000:>10.1f} ms")
+
+
+FILESYSTEM_CALLS = {"scandir", "listdir", "stat", "lstat"}
+
+
+def count_filesystem_calls(function: Callable[[], Any]) -> Counter:
+    """
+    Count the filesystem calls (scandir, listdir, stat, lstat, including os.path.isfile/isdir
+    and DirEntry.stat) made from Python while running a function, in every thread.
+
+    Calls are observed with a profile hook rather than by patching os, so cached DirEntry
+    type checks that issue no syscall are not counted.
+    """
+    counts = Counter()
+
+    def profile(frame: Any, event: str, arg: Any) -> None:
+        if event == "c_call" and arg.__name__ in FILESYSTEM_CALLS:
+            counts[arg.__name__] += 1
+
+    threading.setprofile(profile)
+    sys.setprofile(profile)
+    try:
+        function()
+    finally:
+        sys.setprofile(None)
+        threading.setprofile(None)
+    return counts
+
+
+def peak_memory(function: Callable[[], Any]) -> int:
+    """
+    Return the peak memory in bytes allocated while running a function.
+    """
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+PRESETS = {
+    "balanced": dict(depth=4, fan_out=6, files_per_dir=20),
+    "deep": dict(depth=12, fan_out=2, files_per_dir=5),
+    "wide": dict(depth=1, fan_out=200, files_per_dir=100),
+    "irregular": dict(depth=5, fan_out=5, files_per_dir=15, jitter=0.8,
+                      suffixes={".c": 3, ".h": 3, ".o": 2, ".txt": 1, "": 1}),
+}
+
+
+def benchmark_suite(presets: dict[str, dict[str, Any]], repeat: int = 3) -> None:
+    """
+    Report files/sec, filesystem calls and peak memory of every find_files mode on each tree.
+    """
+    for name, options in presets.items():
+        with tempfile.TemporaryDirectory() as root:
+            num_files = generate_tree(root, **options)
+            num_dirs = sum(1 for _ in os.walk(root))
+            print(f"Tree '{name}': {num_files:,} files in {num_dirs:,} directories")
+            print(f"{'mode':>20} {'files/sec':>14} {'fs calls':>10} {'peak KiB':>10}")
+
+            modes = {
+                "listdir baseline": lambda: find_files_listdir(".c", root),
+                "find_files": lambda: find_files(".c", root),
+                "iter_files (lazy)": lambda: sum(1 for _ in iter_files(".c", root)),
+                "find_files x8": lambda: find_files(".c", root, workers=8),
+                "exclude dir0": lambda: find_files(".c", root, exclude=["dir0"]),
+                "limit 100": lambda: find_files(".c", root, limit=100),
+            }
+            for mode, function in modes.items():
+                elapsed = best_time(function, repeat)
+                calls = sum(count_filesystem_calls(function).values())
+                peak = peak_memory(function)
+                print(f"{mode:>20} {num_files / elapsed:>14,.0f} {calls:>10,} {peak / 1024:>10,.0f}")
+            print()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks for problem_2.find_files.")
+    parser.add_argument("--suite", action="store_true", help="only run the synthetic tree benchmark suite")
+    parser.add_argument("--depth", type=int, help="run the suite on one custom tree of this depth")
+    parser.add_argument("--fan-out", type=int, default=4, help="subdirectories per directory (custom tree)")
+    parser.add_argument("--files", type=int, default=20, help="files per directory (custom tree)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="relative variation of the counts (custom tree)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (custom tree)")
+    args = parser.parse_args()
+
+    if args.depth is not None:
+        benchmark_suite({"custom": dict(depth=args.depth, fan_out=args.fan_out, files_per_dir=args.files,
+                                        jitter=args.jitter, seed=args.seed)})
+    elif args.suite:
+        benchmark_suite(PRESETS)
+    else:
+        benchmark_scandir()
+        benchmark_parallel()
+        benchmark_index()
+        benchmark_multi()
+        benchmark_suite(PRESETS)
@@ -0,0 +1,230 @@
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import zlib
+from typing import Any, Callable
+
+import problem_3
+from problem_3 import (adaptive_huffman_decoding, adaptive_huffman_encoding, code_lengths, compress_blocks,
+                       decompress_blocks, huffman_compress, huffman_compress_bytes, huffman_decoding,
+                       huffman_decoding_packed, huffman_decompress, huffman_encoding, huffman_encoding_packed,
+                       serialize_header)
+
+
+WORDS = ("the of and to in is that it for as with was on be by this are from at or an have not which but "
+         "huffman code tree node frequency bit byte compression decode encode table length symbol stream").split()
+
+
+def generate_corpus(size: int, seed: int = 0) -> dict[str, bytes]:
+    """
+    Build a reproducible corpus of inputs of about size bytes each.
+
+    Parameters:
+    -----------
+    size : int
+        The size of each input in bytes.
+    seed : int
+        The random seed; the same arguments always build the same corpus (default 0).
+
+    Returns:
+    --------
+    Dict[str, bytes]
+        The inputs by name: English-like text, server logs, skewed bytes (Zipf-like),
+        uniformly random bytes and a single repeated byte.
+    """
+    rng = random.Random(seed)
+    word_weights = [1 / (rank + 1) for rank in range(len(WORDS))]
+
+    sentences = []
+    length = 0
+    while length < size:
+        words = rng.choices(WORDS, word_weights, k=rng.randint(5, 15))
+        sentence = " ".join(words).capitalize() + rng.choice(". . . ? !".split()) + " "
+        sentences.append(sentence)
+        length += len(sentence)
+
+    lines = []
+    length = 0
+    while length < size:
+        line = (f"2024-03-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:"
+                f"{rng.randint(0, 59):02d} {rng.choices(['INFO', 'WARN', 'ERROR'], [90, 8, 2])[0]} "
+                f"GET /api/v1/{rng.choice(['users', 'items', 'orders'])}/{rng.randint(1, 99999)} "
+                f"{rng.choices([200, 404, 500], [95, 4, 1])[0]} {rng.randint(1, 999)}ms\n")
+        lines.append(line)
+        length += len(line)
+
+    return {
+        "text": "".join(sentences).encode("ascii")[:size],
+        "logs": "".join(lines).encode("ascii")[:size],
+        "skewed": bytes(rng.choices(range(256), [1 / (byte + 1) ** 1.5 for byte in range(256)], k=size)),
+        "random": rng.randbytes(size),
+        "single": b"a" * size,
+    }
+
+
+def _tree_size(tree: Any) -> int:
+    """
+    Return the size of the header needed to store a tree, as the canonical code header
+    and bit length of huffman_compress, so tree-returning modes compare with blob modes.
+    """
+    return len(serialize_header(code_lengths(tree))) + 8
+
+
+def _huffman_str(data: bytes) -> tuple[Any, int]:
+    encoded, tree = huffman_encoding(data.decode("latin-1"))
+    return (encoded, tree), (len(encoded) + 7) // 8 + _tree_size(tree)    # As if packed
+
+
+def _huffman_packed(data: bytes) -> tuple[Any, int]:
+    packed, bit_length, tree = huffman_encoding_packed(data.decode("latin-1"))
+    return (packed, bit_length, tree), len(packed) + _tree_size(tree)
+
+
+def _blob(encoded: bytes) -> tuple[bytes, int]:
+    return encoded, len(encoded)
+
+
+BLOCK_WORKERS = 1   # tracemalloc only sees this process, so the blocks peak would miss worker processes
+
+NOTES = {
+    "ratio": "compressed size / original size; huffman_encoding and packed return a tree, counted as the "
+             "canonical code header huffman_compress would store for it",
+    "peak_bytes": "tracemalloc peak of one round trip in this process only; the blocks mode runs with "
+                  f"workers={BLOCK_WORKERS}, so its peak covers a single process",
+}
+
+# Mode name -> (encode: bytes -> (encoded, compressed size), decode: encoded -> bytes)
+MODES: dict[str, tuple[Callable[[bytes], tuple[Any, int]], Callable[[Any], bytes]]] = {
+    "huffman_encoding": (_huffman_str, lambda encoded: huffman_decoding(*encoded).encode("latin-1")),
+    "packed": (_huffman_packed, lambda encoded: huffman_decoding_packed(*encoded).encode("latin-1")),
+    "canonical": (lambda data: _blob(huffman_compress(data.decode("latin-1"))),
+                  lambda blob: huffman_decompress(blob).encode("latin-1")),
+    "bytes": (lambda data: _blob(huffman_compress_bytes(data)),
+              lambda blob: huffman_decompress(blob).encode("latin-1")),
+    "blocks": (lambda data: _blob(compress_blocks(data, workers=BLOCK_WORKERS)),
+               lambda archive: decompress_blocks(archive, workers=BLOCK_WORKERS)),
+    "adaptive": (lambda data: _blob(adaptive_huffman_encoding(data.decode("latin-1"))),
+                 lambda blob: adaptive_huffman_decoding(blob).encode("latin-1")),
+    "zlib-1": (lambda data: _blob(zlib.compress(data, 1)), zlib.decompress),
+    "zlib-6": (lambda data: _blob(zlib.compress(data, 6)), zlib.decompress),
+    "zlib-9": (lambda data: _blob(zlib.compress(data, 9)), zlib.decompress),
+}
+
+
+def best_time(function: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    """
+    Return the best wall-clock time of several runs, and the result of the last one.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def peak_memory(function: Callable[[], Any]) -> int:
+    """
+    Return the peak memory in bytes allocated while running a function, in this process
+    only: allocations of worker processes are not seen.
+    """
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_mode(mode: str, data: bytes, repeat: int = 3, measure_memory: bool = True) -> dict[str, Any]:
+    """
+    Measure one mode on one input, checking that it round-trips.
+
+    The peak memory of a round trip is measured in an extra pass, because tracing slows
+    every allocation down.
+
+    Returns:
+    --------
+    Dict[str, Any]
+        Encode and decode throughput in MB/s, compressed size, ratio (compressed / original)
+        and peak memory in bytes (None without measure_memory).
+    """
+    encode, decode = MODES[mode]
+    encode_time, (encoded, compressed_size) = best_time(lambda: encode(data), repeat)
+    decode_time, decoded = best_time(lambda: decode(encoded), repeat)
+    if decoded != data:
+        raise AssertionError(f"{mode} does not round-trip")
+
+    peak = peak_memory(lambda: decode(encode(data)[0])) if measure_memory else None
+    return {
+        "mode": mode,
+        "encode_mb_s": len(data) / 1e6 / encode_time,
+        "decode_mb_s": len(data) / 1e6 / decode_time,
+        "compressed_bytes": compressed_size,
+        "ratio": compressed_size / len(data),
+        "peak_bytes": peak,
+    }
+
+
+def benchmark_suite(size: int, seed: int, modes: list[str], corpora: list[str], repeat: int,
+                    measure_memory: bool, verbose: bool = True) -> dict[str, Any]:
+    """
+    Run every mode on every input of the corpus.
+
+    Returns:
+    --------
+    Dict[str, Any]
+        The run parameters and environment, and one result row per (corpus, mode) pair.
+    """
+    corpus = generate_corpus(size, seed)
+    report = {
+        "python": platform.python_version(),
+        "numpy": problem_3.np is not None,
+        "size": size,
+        "seed": seed,
+        "repeat": repeat,
+        "notes": NOTES,
+        "results": [],
+    }
+    for name in corpora:
+        if verbose:
+            print(f"Corpus '{name}' ({size:,} bytes)", file=sys.stderr)
+            print(f"{'mode':>18} {'encode MB/s':>12} {'decode MB/s':>12} {'ratio':>8} {'peak KiB':>10}",
+                  file=sys.stderr)
+        for mode in modes:
+            row = {"corpus": name, **benchmark_mode(mode, corpus[name], repeat, measure_memory)}
+            report["results"].append(row)
+            if verbose:
+                peak = f"{row['peak_bytes'] / 1024:,.0f}" if row["peak_bytes"] is not None else "-"
+                print(f"{mode:>18} {row['encode_mb_s']:>12.2f} {row['decode_mb_s']:>12.2f} "
+                      f"{row['ratio']:>8.3f} {peak:>10}", file=sys.stderr)
+        if verbose:
+            print(file=sys.stderr)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compression benchmarks for problem_3, with zlib baselines.")
+    parser.add_argument("--size", type=int, default=1 << 20, help="bytes per corpus input (default 1 MiB)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the corpus (default 0)")
+    parser.add_argument("--modes", default=",".join(MODES),
+                        help=f"comma-separated modes among {', '.join(MODES)}")
+    parser.add_argument("--corpora", default="text,logs,skewed,random,single",
+                        help="comma-separated corpus inputs among text, logs, skewed, random, single")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, the best is kept")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory pass")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON to PATH ('-' for stdout)")
+    args = parser.parse_args()
+
+    report = benchmark_suite(args.size, args.seed, args.modes.split(","), args.corpora.split(","),
+                             args.repeat, not args.no_memory)
+    if args.json == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, "w") as output:
+            json.dump(report, output, indent=2)
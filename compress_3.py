@@ -0,0 +1,62 @@
+import argparse
+import mmap
+import os
+import sys
+import time
+
+from problem_3 import (BLOCK_MAGIC, BLOCK_SIZE, FILE_CHUNK_SIZE, BlockArchive, compress_file,
+                       compress_file_blocks, decompress_file)
+
+
+def decompress_file_blocks(source_path: str, target_path: str, workers: int) -> int:
+    """
+    Decompress a block archive file, decoding the blocks in parallel.
+    """
+    with open(source_path, "rb") as source, mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        with open(target_path, "wb") as target:
+            for block in BlockArchive(data).iter_blocks(workers):
+                target.write(block)
+            return target.tell()
+
+
+def is_block_archive(path: str) -> bool:
+    """
+    Tell block archives from single-stream compressed files by their magic number.
+    """
+    with open(path, "rb") as source:
+        return source.read(len(BLOCK_MAGIC)) == BLOCK_MAGIC
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compress or decompress files with the problem_3 Huffman coder.")
+    parser.add_argument("mode", choices=("compress", "decompress"), help="the operation to perform")
+    parser.add_argument("source", help="the input file")
+    parser.add_argument("target", help="the output file")
+    parser.add_argument("--chunk-size", type=int, default=FILE_CHUNK_SIZE,
+                        help=f"bytes processed per step (default {FILE_CHUNK_SIZE:,})")
+    parser.add_argument("--blocks", action="store_true",
+                        help="compress into independent blocks, with an index for random access")
+    parser.add_argument("--block-size", type=int, default=BLOCK_SIZE,
+                        help=f"input bytes per block with --blocks (default {BLOCK_SIZE:,})")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes for block archives (default: one per CPU)")
+    parser.add_argument("--max-length", type=int, help="limit codes to this many bits when compressing")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        if args.mode == "compress" and args.blocks:
+            written = compress_file_blocks(args.source, args.target, args.block_size, args.workers, args.max_length)
+        elif args.mode == "compress":
+            written = compress_file(args.source, args.target, args.chunk_size, args.max_length)
+        elif is_block_archive(args.source):
+            written = decompress_file_blocks(args.source, args.target, args.workers)
+        else:
+            written = decompress_file(args.source, args.target, args.chunk_size)
+    except (OSError, ValueError) as error:
+        sys.exit(f"{args.mode} failed: {error}")
+    elapsed = time.perf_counter() - start
+
+    read = os.path.getsize(args.source)
+    print(f"{args.source} ({read:,} bytes) -> {args.target} ({written:,} bytes) "
+          f"in {elapsed:.2f} s, {read / 2**20 / max(elapsed, 1e-9):.1f} MiB/s")
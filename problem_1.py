@@ -1,21 +1,1102 @@
+import array
+import asyncio
+import concurrent.futures
+import functools
+import inspect
+import multiprocessing
+import struct
+import sys
+import threading
+import time
 from collections import OrderedDict
-from typing import Any, Optional
+from multiprocessing import shared_memory
+from typing import Any, Callable, Optional
+
+class LatencyHistogram:
+    """
+    A histogram of operation latencies with power-of-two nanosecond buckets.
+
+    Attributes:
+    -----------
+    buckets : list[int]
+        buckets[i] counts the samples whose latency in ns has bit length i (i.e. < 2 ** i ns).
+    count : int
+        The number of recorded samples.
+    total_ns : int
+        The sum of all recorded latencies in nanoseconds.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructs all the necessary attributes for the LatencyHistogram object.
+        """
+        self.buckets = [0] * 64
+        self.count = 0
+        self.total_ns = 0
+
+    def record(self, latency_ns: int) -> None:
+        """
+        Add one latency sample, in nanoseconds.
+        """
+        self.buckets[min(latency_ns.bit_length(), 63)] += 1
+        self.count += 1
+        self.total_ns += latency_ns
+
+    def percentile(self, fraction: float) -> int:
+        """
+        Return an upper bound in ns of the given percentile (e.g. 0.99), 0 if there are no samples.
+        """
+        if self.count == 0:
+            return 0
+        threshold = fraction * self.count
+        seen = 0
+        for bit_length, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= threshold:
+                return 1 << bit_length
+        return 1 << 63
+
+
+class CacheStats:
+    """
+    Counters and latency histograms collected by an LRU_Cache created with record_stats=True.
+
+    Attributes:
+    -----------
+    hits : int
+        The number of get calls that found their key.
+    misses : int
+        The number of get calls that returned -1.
+    insertions : int
+        The number of set calls that added a new key.
+    evictions : int
+        The number of entries invalidated to make room for new ones.
+    get_latency : LatencyHistogram
+        The latency of get calls.
+    set_latency : LatencyHistogram
+        The latency of set calls.
+    """
+
+    def __init__(self, cache: 'LRU_Cache') -> None:
+        """
+        Constructs all the necessary attributes for the CacheStats object.
+
+        Parameters:
+        -----------
+        cache : LRU_Cache
+            The cache these statistics describe.
+        """
+        self._cache = cache
+        self.hits = 0
+        self.misses = 0
+        self.insertions = 0
+        self.evictions = 0
+        self.get_latency = LatencyHistogram()
+        self.set_latency = LatencyHistogram()
+
+    @property
+    def size(self) -> int:
+        """
+        The number of entries currently stored in the cache.
+        """
+        return len(self._cache.cache)
+
+    @property
+    def hit_ratio(self) -> float:
+        """
+        The share of get calls that were hits, 0.0 before the first get.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Return the current statistics as a plain dictionary, e.g. for logging or JSON export.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio,
+            "insertions": self.insertions,
+            "evictions": self.evictions,
+            "size": self.size,
+            "get_p50_ns": self.get_latency.percentile(0.5),
+            "get_p99_ns": self.get_latency.percentile(0.99),
+            "set_p50_ns": self.set_latency.percentile(0.5),
+            "set_p99_ns": self.set_latency.percentile(0.99),
+        }
+
 
 class LRU_Cache:
     """
-    A class to represent a Least Recently Used (LRU) cache.
+    A class to represent a Least Recently Used (LRU) cache.
+
+    Attributes:
+    -----------
+    capacity : int
+        The maximum number of items the cache can hold.
+    cache : OrderedDict[int, Any]
+        The ordered dictionary to store cache items.
+    stats : Optional[CacheStats]
+        The collected statistics, None unless the cache was created with record_stats=True.
+    on_evict : Optional[Callable[[int, Any], None]]
+        A listener called with the key and value of every evicted entry.
+    """
+
+    def __init__(self, capacity: int, record_stats: bool = False,
+                 on_evict: Optional[Callable[[int, Any], None]] = None) -> None:
+        """
+        Constructs all the necessary attributes for the LRU_Cache object.
+
+        Parameters:
+        -----------
+        capacity : int
+            The maximum number of items the cache can hold.
+        record_stats : bool
+            Whether to collect hit, miss, insertion, eviction and latency statistics (default False).
+        on_evict : Optional[Callable[[int, Any], None]]
+            A listener called with the key and value of every evicted entry (default None).
+        """
+        self.capacity = capacity
+        self.cache = OrderedDict()
+        self.on_evict = on_evict
+        self.stats = None
+
+        if record_stats:
+            # Shadow get/set with recording versions on this instance only, so caches
+            # without statistics keep running the plain methods at no extra cost
+            self.stats = CacheStats(self)
+            self.get = self._recorded_get
+            self.set = self._recorded_set
+
+    def __len__(self) -> int:
+        """
+        Return the number of items currently stored.
+        """
+        return len(self.cache)
+
+    def _recorded_get(self, key: int) -> Optional[Any]:
+        """
+        Run get, recording its latency and whether it was a hit or a miss.
+        """
+        start = time.perf_counter_ns()
+        value = type(self).get(self, key)
+        self.stats.get_latency.record(time.perf_counter_ns() - start)
+
+        if type(value) is int and value == -1:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return value
+
+    def _recorded_set(self, key: int, value: Any, *args: Any, **kwargs: Any) -> None:
+        """
+        Run set, recording its latency and whether it inserted a new key.
+        """
+        is_new = key not in self.cache
+        start = time.perf_counter_ns()
+        type(self).set(self, key, value, *args, **kwargs)
+        self.stats.set_latency.record(time.perf_counter_ns() - start)
+
+        if is_new and key in self.cache:
+            self.stats.insertions += 1
+
+    def _evict(self) -> None:
+        """
+        Remove the least recently used item (first item in OrderedDict) and report it.
+        """
+        key, value = self.cache.popitem(last=False)
+        if self.stats is not None:
+            self.stats.evictions += 1
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+    def get(self, key: int) -> Optional[Any]:
+        """
+        Get the value of the key if the key exists in the cache, otherwise return -1.
+
+        Parameters:
+        -----------
+        key : int
+            The key to be accessed in the cache.
+
+        Returns:
+        --------
+        Optional[Any]
+            The value associated with the key if it exists, otherwise -1.
+        """
+        if key not in self.cache:
+            return -1
+        
+        # Since both "get" and "set" operations are considered as an "use operation"
+        # move the key that has just been used to the end, and return its value.
+        self.cache.move_to_end(key)
+        return self.cache[key]
+
+    def set(self, key: int, value: Any) -> None:
+        """
+        Set or insert the value if the key is not already present. When the cache reaches 
+        its capacity, it should invalidate the least recently used item before inserting 
+        a new item.
+
+        Parameters:
+        -----------
+        key : int
+            The key to be inserted or updated in the cache.
+        value : Any
+            The value to be associated with the key.
+        """
+        
+        # If capacity is bigger than 0 then set the key value
+        if self.capacity > 0:
+            # Check if key is valid
+            if isinstance(key, int):
+                if key in self.cache:
+                    # Move key to end
+                    self.cache.move_to_end(key)
+                elif len(self.cache) >= self.capacity:
+                    # Remove the least recently used item (first item in OrderedDict)
+                    self._evict()
+                # Add or update the key value
+                self.cache[key] = value
+
+
+def default_weigher(key: int, value: Any) -> int:
+    """
+    Estimate the memory cost of a cache entry in bytes using sys.getsizeof.
+
+    Containers are measured one level deep, so a list of strings also counts its strings.
+
+    Parameters:
+    -----------
+    key : int
+        The key of the entry.
+    value : Any
+        The value of the entry.
+
+    Returns:
+    --------
+    int
+        The estimated size of the entry in bytes.
+    """
+    size = sys.getsizeof(key) + sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(sys.getsizeof(item) for item in value)
+    return size
+
+
+class Weighted_LRU_Cache(LRU_Cache):
+    """
+    An LRU cache whose capacity is a budget of weight units (bytes by default) instead
+    of a number of entries.
+
+    Attributes:
+    -----------
+    capacity : int
+        The maximum total weight the cache can hold.
+    cache : OrderedDict[int, Any]
+        The ordered dictionary to store cache items.
+    weigher : Callable[[int, Any], int]
+        The function giving the weight of an entry.
+    weights : dict[int, int]
+        The weight of each stored entry.
+    total_weight : int
+        The sum of the weights of all stored entries.
+    """
+
+    def __init__(self, capacity: int, weigher: Callable[[int, Any], int] = default_weigher,
+                 **kwargs: Any) -> None:
+        """
+        Constructs all the necessary attributes for the Weighted_LRU_Cache object.
+
+        Parameters:
+        -----------
+        capacity : int
+            The maximum total weight the cache can hold.
+        weigher : Callable[[int, Any], int]
+            The function giving the weight of an entry (default: default_weigher).
+        **kwargs : Any
+            The record_stats and on_evict options of LRU_Cache.
+        """
+        super().__init__(capacity, **kwargs)
+        self.weigher = weigher
+        self.weights = {}
+        self.total_weight = 0
+
+    def set(self, key: int, value: Any) -> None:
+        """
+        Set or insert the value of the key. Least recently used items are invalidated
+        until the new entry fits in the budget. An entry heavier than the whole budget
+        is rejected (and any older value of the key dropped) without evicting anything else.
+
+        Parameters:
+        -----------
+        key : int
+            The key to be inserted or updated in the cache.
+        value : Any
+            The value to be associated with the key.
+        """
+        if self.capacity <= 0 or not isinstance(key, int):
+            return
+
+        weight = self.weigher(key, value)
+        if weight < 0:
+            raise ValueError(f"Weigher returned a negative weight for key {key}.")
+
+        # Remove the old entry first, its weight must not count against the new one
+        if key in self.cache:
+            del self.cache[key]
+            self.total_weight -= self.weights.pop(key)
+
+        # Reject oversized entries instead of flushing the whole cache for them
+        if weight > self.capacity:
+            return
+
+        # Remove least recently used items until the new entry fits
+        while self.total_weight + weight > self.capacity:
+            self.total_weight -= self.weights.pop(next(iter(self.cache)))
+            self._evict()
+
+        self.cache[key] = value
+        self.weights[key] = weight
+        self.total_weight += weight
+
+
+class TTL_LRU_Cache(LRU_Cache):
+    """
+    An LRU cache whose entries also expire after a time-to-live (TTL).
+
+    Expired entries are dropped lazily on get, and a hashed timer wheel is swept as
+    time advances so that expired entries are freed without scanning the whole cache.
+
+    Attributes:
+    -----------
+    capacity : int
+        The maximum number of items the cache can hold.
+    cache : OrderedDict[int, Any]
+        The ordered dictionary to store cache items.
+    default_ttl : Optional[float]
+        The TTL in seconds applied when set is called without one (None never expires).
+    resolution : float
+        The duration of one timer wheel tick in seconds.
+    clock : Callable[[], float]
+        The monotonic clock used to read the current time.
+    expires : dict[int, float]
+        The expiry time of every entry that has a TTL.
+    wheel : list[set[int]]
+        The timer wheel slots, each holding the keys expiring in that tick (modulo the wheel size).
+    """
+
+    def __init__(self, capacity: int, default_ttl: Optional[float] = None, resolution: float = 1.0,
+                 wheel_size: int = 512, clock: Callable[[], float] = time.monotonic, **kwargs: Any) -> None:
+        """
+        Constructs all the necessary attributes for the TTL_LRU_Cache object.
+
+        Parameters:
+        -----------
+        capacity : int
+            The maximum number of items the cache can hold.
+        default_ttl : Optional[float]
+            The TTL in seconds used when set is called without one (default: never expire).
+        resolution : float
+            The duration of one timer wheel tick in seconds (default 1.0).
+        wheel_size : int
+            The number of slots in the timer wheel (default 512).
+        clock : Callable[[], float]
+            The clock returning the current time in seconds (default time.monotonic).
+        **kwargs : Any
+            The record_stats and on_evict options of LRU_Cache.
+        """
+        if resolution <= 0 or wheel_size < 1:
+            raise ValueError("resolution must be positive and wheel_size at least 1.")
+        if default_ttl is not None and default_ttl < 0:
+            raise ValueError("default_ttl must not be negative.")
+
+        super().__init__(capacity, **kwargs)
+        self.default_ttl = default_ttl
+        self.resolution = resolution
+        self.clock = clock
+        self.expires = {}
+        self.wheel = [set() for _ in range(wheel_size)]
+        self.current_tick = self._tick(clock())
+
+    def _tick(self, timestamp: float) -> int:
+        """
+        Convert a timestamp to a timer wheel tick number.
+        """
+        return int(timestamp // self.resolution)
+
+    def _unschedule(self, key: int) -> None:
+        """
+        Remove a key from the expiry table and its timer wheel slot.
+        """
+        expires_at = self.expires.pop(key, None)
+        if expires_at is not None:
+            self.wheel[self._tick(expires_at) % len(self.wheel)].discard(key)
+
+    def _remove(self, key: int) -> None:
+        """
+        Remove a key from the cache, the expiry table and its timer wheel slot.
+        """
+        del self.cache[key]
+        self._unschedule(key)
+
+    def _advance(self, now: float) -> None:
+        """
+        Sweep the timer wheel slots of the ticks that fully passed since the last sweep,
+        dropping expired entries.
+
+        Each slot is visited once per elapsed tick, so the cost is proportional to the
+        time elapsed and to the entries found in those slots, never to the cache size.
+        The current tick is left pending, since entries expiring later in it are still
+        valid, and entries scheduled for a later revolution of the wheel stay in their slot.
+        """
+        now_tick = self._tick(now)
+        if now_tick <= self.current_tick:
+            return
+
+        # After a full revolution every slot has been due once, no need to loop further
+        first_tick = max(self.current_tick, now_tick - len(self.wheel))
+        for tick in range(first_tick, now_tick):
+            slot = self.wheel[tick % len(self.wheel)]
+            if slot:
+                for key in [key for key in slot if self.expires[key] <= now]:
+                    self._remove(key)
+        self.current_tick = now_tick
+
+    def get(self, key: int) -> Optional[Any]:
+        """
+        Get the value of the key if the key exists in the cache and has not expired,
+        otherwise return -1.
+
+        Parameters:
+        -----------
+        key : int
+            The key to be accessed in the cache.
+
+        Returns:
+        --------
+        Optional[Any]
+            The value associated with the key if it is still valid, otherwise -1.
+        """
+        now = self.clock()
+        self._advance(now)
+        if key not in self.cache:
+            return -1
+
+        # Lazy expiry for entries that expired within the current tick
+        expires_at = self.expires.get(key)
+        if expires_at is not None and expires_at <= now:
+            self._remove(key)
+            return -1
+
+        self.cache.move_to_end(key)
+        return self.cache[key]
+
+    def set(self, key: int, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Set or insert the value of the key with an optional TTL. When the cache reaches
+        its capacity, the least recently used item is invalidated first.
+
+        Parameters:
+        -----------
+        key : int
+            The key to be inserted or updated in the cache.
+        value : Any
+            The value to be associated with the key.
+        ttl : Optional[float]
+            The TTL in seconds for this entry (default: the cache default_ttl).
+
+        Raises:
+        -------
+        ValueError
+            If ttl is negative.
+        """
+        if ttl is not None and ttl < 0:
+            raise ValueError("ttl must not be negative.")
+        if self.capacity <= 0 or not isinstance(key, int):
+            return
+
+        now = self.clock()
+        self._advance(now)
+
+        if key in self.cache:
+            self._remove(key)
+        elif len(self.cache) >= self.capacity:
+            # Remove the least recently used item (first item in OrderedDict)
+            self._unschedule(next(iter(self.cache)))
+            self._evict()
+
+        self.cache[key] = value
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl is not None:
+            expires_at = now + ttl
+            self.expires[key] = expires_at
+            self.wheel[self._tick(expires_at) % len(self.wheel)].add(key)
+
+
+class CountMinSketch:
+    """
+    A count-min sketch estimating how often keys were seen, with periodic aging.
+
+    Counters saturate at 15 (like 4-bit counters) and are all halved once `sample_size`
+    increments have been recorded, so old popularity fades away.
+
+    Attributes:
+    -----------
+    width : int
+        The number of counters per row (a power of two).
+    depth : int
+        The number of rows, each indexed by a different hash.
+    table : list[list[int]]
+        The counters.
+    sample_size : int
+        The number of increments after which every counter is halved.
+    additions : int
+        The number of increments recorded since the last aging.
+    """
+
+    SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0x85EBCA77C2B2AE63)
+    MAX_COUNT = 15
+
+    def __init__(self, width: int, sample_size: Optional[int] = None) -> None:
+        """
+        Constructs all the necessary attributes for the CountMinSketch object.
+
+        Parameters:
+        -----------
+        width : int
+            The minimum number of counters per row, rounded up to a power of two.
+        sample_size : Optional[int]
+            The number of increments between two agings (default 10 * width).
+        """
+        self.width = 1 << max(width - 1, 1).bit_length()
+        self.mask = self.width - 1
+        self.depth = len(self.SEEDS)
+        self.table = [[0] * self.width for _ in range(self.depth)]
+        self.sample_size = sample_size if sample_size is not None else 10 * self.width
+        self.additions = 0
+
+    def _indexes(self, key: int) -> list[int]:
+        """
+        Return the counter index of the key in each row.
+        """
+        h = hash(key)
+        return [((h ^ seed) * 0x2545F4914F6CDD1D >> 17) & self.mask for seed in self.SEEDS]
+
+    def increment(self, key: int) -> None:
+        """
+        Record one occurrence of the key, aging the sketch when the sample is full.
+
+        Parameters:
+        -----------
+        key : int
+            The key that was seen.
+        """
+        for row, index in zip(self.table, self._indexes(key)):
+            if row[index] < self.MAX_COUNT:
+                row[index] += 1
+
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.age()
+
+    def estimate(self, key: int) -> int:
+        """
+        Return the estimated frequency of the key (never an underestimate before aging).
+
+        Parameters:
+        -----------
+        key : int
+            The key to look up.
+
+        Returns:
+        --------
+        int
+            The smallest counter of the key across all rows.
+        """
+        return min(row[index] for row, index in zip(self.table, self._indexes(key)))
+
+    def age(self) -> None:
+        """
+        Halve every counter. This is O(width) but runs once per `sample_size` increments,
+        so its amortized cost per increment is O(1).
+        """
+        for row in self.table:
+            for index, count in enumerate(row):
+                row[index] = count >> 1
+        self.additions //= 2
+
+
+class TinyLFU_Cache:
+    """
+    A cache using the W-TinyLFU policy: a small window LRU in front of a main segmented
+    LRU, with a frequency sketch deciding which keys are worth admitting to the main area.
+
+    A key evicted from the window only replaces the main area's victim if it has been
+    seen more often, so a burst of one-hit wonders cannot flush the hot set.
+
+    Attributes:
+    -----------
+    capacity : int
+        The maximum number of items the cache can hold.
+    window : OrderedDict[int, Any]
+        The admission window, a plain LRU holding about 1% of the capacity.
+    probation : OrderedDict[int, Any]
+        The main area segment for keys hit once since admission.
+    protected : OrderedDict[int, Any]
+        The main area segment for keys hit again, about 80% of the main area.
+    sketch : CountMinSketch
+        The frequency estimator used for admission decisions.
+    """
+
+    def __init__(self, capacity: int, window_ratio: float = 0.01, protected_ratio: float = 0.8) -> None:
+        """
+        Constructs all the necessary attributes for the TinyLFU_Cache object.
+
+        Parameters:
+        -----------
+        capacity : int
+            The maximum number of items the cache can hold.
+        window_ratio : float
+            The share of the capacity used by the window LRU (default 0.01).
+        protected_ratio : float
+            The share of the main area used by the protected segment (default 0.8).
+        """
+        self.capacity = capacity
+        self.window_capacity = max(1, int(capacity * window_ratio)) if capacity > 0 else 0
+        self.main_capacity = max(capacity - self.window_capacity, 0)
+        self.protected_capacity = int(self.main_capacity * protected_ratio)
+        self.window = OrderedDict()
+        self.probation = OrderedDict()
+        self.protected = OrderedDict()
+        self.sketch = CountMinSketch(max(capacity, 1))
+
+    def __len__(self) -> int:
+        """
+        Return the number of items currently stored.
+        """
+        return len(self.window) + len(self.probation) + len(self.protected)
+
+    def _promote(self, key: int) -> None:
+        """
+        Move a key hit in probation to the protected segment, demoting the protected LRU if needed.
+        """
+        self.protected[key] = self.probation.pop(key)
+        if len(self.protected) > self.protected_capacity:
+            old_key, old_value = self.protected.popitem(last=False)
+            self.probation[old_key] = old_value
+
+    def _access(self, key: int) -> Optional[OrderedDict]:
+        """
+        Mark a stored key as used and return the segment now holding it, or None if it is not stored.
+        """
+        if key in self.window:
+            self.window.move_to_end(key)
+            return self.window
+        if key in self.protected:
+            self.protected.move_to_end(key)
+            return self.protected
+        if key in self.probation:
+            self._promote(key)
+            return self.protected if key in self.protected else self.probation
+        return None
+
+    def _admit(self, key: int, value: Any) -> None:
+        """
+        Offer a key evicted from the window to the main area.
+        """
+        if len(self.probation) + len(self.protected) < self.main_capacity:
+            self.probation[key] = value
+            return
+
+        # The victim is the main area's least recently used key
+        victims = self.probation if self.probation else self.protected
+        if not victims:
+            return  # No main area at all (tiny capacities), the candidate is dropped
+        victim = next(iter(victims))
+
+        if self.sketch.estimate(key) > self.sketch.estimate(victim):
+            del victims[victim]
+            self.probation[key] = value
+
+    def get(self, key: int) -> Optional[Any]:
+        """
+        Get the value of the key if the key exists in the cache, otherwise return -1.
+
+        Parameters:
+        -----------
+        key : int
+            The key to be accessed in the cache.
+
+        Returns:
+        --------
+        Optional[Any]
+            The value associated with the key if it exists, otherwise -1.
+        """
+        self.sketch.increment(key)
+        segment = self._access(key)
+        if segment is None:
+            return -1
+        return segment[key]
+
+    def set(self, key: int, value: Any) -> None:
+        """
+        Set or insert the value of the key. New keys enter the window; the key the window
+        evicts is admitted to the main area only if it is more popular than the main victim.
+
+        Parameters:
+        -----------
+        key : int
+            The key to be inserted or updated in the cache.
+        value : Any
+            The value to be associated with the key.
+        """
+        if self.capacity <= 0 or not isinstance(key, int):
+            return
+
+        self.sketch.increment(key)
+        segment = self._access(key)
+        if segment is not None:
+            segment[key] = value
+            return
+
+        self.window[key] = value
+        if len(self.window) > self.window_capacity:
+            candidate, candidate_value = self.window.popitem(last=False)
+            self._admit(candidate, candidate_value)
+
+
+class Compact_CLOCK_Cache:
+    """
+    A memory-compact cache for int keys, using CLOCK eviction over array-backed slot tables.
+
+    Keys live unboxed in an int64 array, reference bits in a bytearray and the key to slot
+    mapping in an open-addressing int32 array, so an entry costs a few machine words
+    instead of an OrderedDict node, a boxed key and a dict entry.
+
+    Attributes:
+    -----------
+    capacity : int
+        The maximum number of items the cache can hold.
+    keys : array.array
+        The key stored in each slot (int64).
+    values : list[Any]
+        The value stored in each slot.
+    referenced : bytearray
+        The CLOCK reference bit of each slot.
+    index : array.array
+        The open-addressing index (int32 slot numbers, -1 for an empty position).
+    """
+
+    KEY_MIN, KEY_MAX = -(1 << 63), (1 << 63) - 1
+
+    def __init__(self, capacity: int) -> None:
+        """
+        Constructs all the necessary attributes for the Compact_CLOCK_Cache object.
+
+        Parameters:
+        -----------
+        capacity : int
+            The maximum number of items the cache can hold.
+        """
+        self.capacity = max(capacity, 0)
+        self.keys = array.array("q", bytes(8 * self.capacity))
+        self.values = [None] * self.capacity
+        self.referenced = bytearray(self.capacity)
+        # Keep the index at most half full so probe sequences stay short
+        self.index_size = 1 << max(2 * self.capacity - 1, 1).bit_length()
+        self.mask = self.index_size - 1
+        self.shift = 64 - (self.index_size.bit_length() - 1)   # Fibonacci hashing keeps the top bits
+        self.index = array.array("i", [-1]) * self.index_size
+        self.count = 0
+        self.hand = 0
+
+    def __len__(self) -> int:
+        """
+        Return the number of items currently stored.
+        """
+        return self.count
+
+    def _home(self, key: int) -> int:
+        """
+        Return the preferred index position of the key (64-bit Fibonacci hashing), so every
+        bit of the key reaches the position and keys differing only in high bits do not cluster.
+        """
+        return (key * 0x9E3779B97F4A7C15 & 0xFFFFFFFFFFFFFFFF) >> self.shift
+
+    def _find(self, key: int) -> tuple[int, int]:
+        """
+        Return (index position, slot) of the key, or (first empty position, -1) if it is absent.
+        """
+        index, keys, mask = self.index, self.keys, self.mask
+        position = self._home(key)
+        while True:
+            slot = index[position]
+            if slot == -1 or keys[slot] == key:
+                return position, slot
+            position = (position + 1) & mask
+
+    def _index_delete(self, position: int) -> None:
+        """
+        Remove an index entry with backward-shift deletion, so no tombstones are needed.
+        """
+        index, keys, mask = self.index, self.keys, self.mask
+        hole = position
+        position = (position + 1) & mask
+        while index[position] != -1:
+            home = self._home(keys[index[position]])
+            # Move the entry into the hole unless its home lies cyclically in (hole, position]
+            if (position - home) & mask >= (position - hole) & mask:
+                index[hole] = index[position]
+                hole = position
+            position = (position + 1) & mask
+        index[hole] = -1
+
+    def get(self, key: int) -> Optional[Any]:
+        """
+        Get the value of the key if the key exists in the cache, otherwise return -1.
+
+        Parameters:
+        -----------
+        key : int
+            The key to be accessed in the cache.
+
+        Returns:
+        --------
+        Optional[Any]
+            The value associated with the key if it exists, otherwise -1.
+        """
+        if self.capacity == 0 or not isinstance(key, int) or not self.KEY_MIN <= key <= self.KEY_MAX:
+            return -1
+
+        # Inlined _find, get is the hot path
+        index, keys, mask = self.index, self.keys, self.mask
+        position = (key * 0x9E3779B97F4A7C15 & 0xFFFFFFFFFFFFFFFF) >> self.shift
+        slot = index[position]
+        while slot != -1:
+            if keys[slot] == key:
+                self.referenced[slot] = 1   # Second chance in the CLOCK sweep
+                return self.values[slot]
+            position = (position + 1) & mask
+            slot = index[position]
+        return -1
+
+    def set(self, key: int, value: Any) -> None:
+        """
+        Set or insert the value of the key. When the cache reaches its capacity, the CLOCK
+        hand evicts the first entry not used since its last pass.
+
+        Parameters:
+        -----------
+        key : int
+            The key to be inserted or updated in the cache.
+        value : Any
+            The value to be associated with the key.
+        """
+        if self.capacity == 0 or not isinstance(key, int) or not self.KEY_MIN <= key <= self.KEY_MAX:
+            return
+
+        position, slot = self._find(key)
+        if slot != -1:
+            self.values[slot] = value
+            self.referenced[slot] = 1
+            return
+
+        if self.count < self.capacity:
+            slot = self.count
+            self.count += 1
+        else:
+            # CLOCK: clear reference bits until an entry without one is found
+            referenced = self.referenced
+            while referenced[self.hand]:
+                referenced[self.hand] = 0
+                self.hand = (self.hand + 1) % self.capacity
+            slot = self.hand
+            self.hand = (self.hand + 1) % self.capacity
+            self._index_delete(self._find(self.keys[slot])[0])
+            position = self._find(key)[0]   # The deletion may have shifted entries
+
+        self.index[position] = slot
+        self.keys[slot] = key
+        self.values[slot] = value
+        self.referenced[slot] = 0
+
+
+class FIFO_Cache(LRU_Cache):
+    """
+    A First In, First Out cache: like LRU_Cache, but using an entry does not protect it,
+    the oldest inserted entry is always the one evicted.
+    """
+
+    def get(self, key: int) -> Optional[Any]:
+        """
+        Get the value of the key if the key exists in the cache, otherwise return -1.
+        Unlike LRU_Cache, the insertion order is left unchanged.
+
+        Parameters:
+        -----------
+        key : int
+            The key to be accessed in the cache.
+
+        Returns:
+        --------
+        Optional[Any]
+            The value associated with the key if it exists, otherwise -1.
+        """
+        return self.cache.get(key, -1)
+
+    def set(self, key: int, value: Any) -> None:
+        """
+        Set or insert the value of the key. Updating a key keeps its place in the queue;
+        when the cache is full, the oldest inserted entry is invalidated first.
+
+        Parameters:
+        -----------
+        key : int
+            The key to be inserted or updated in the cache.
+        value : Any
+            The value to be associated with the key.
+        """
+        if self.capacity <= 0 or not isinstance(key, int):
+            return
+        if key not in self.cache and len(self.cache) >= self.capacity:
+            self._evict()
+        self.cache[key] = value
+
+
+class TwoQ_Cache:
+    """
+    A cache using the 2Q policy (Johnson and Shasha): new keys enter a FIFO queue (A1in),
+    keys evicted from it are remembered without their value (A1out), and only keys seen
+    again while remembered reach the main LRU (Am). One-time scans therefore only churn A1in.
+
+    Attributes:
+    -----------
+    capacity : int
+        The maximum number of items the cache can hold.
+    a1in : OrderedDict[int, Any]
+        The FIFO of keys seen once recently, about 25% of the capacity.
+    a1out : OrderedDict[int, None]
+        The ghost FIFO of keys evicted from a1in, about 50% of the capacity.
+    am : OrderedDict[int, Any]
+        The LRU of keys seen more than once.
+    """
+
+    def __init__(self, capacity: int, in_ratio: float = 0.25, out_ratio: float = 0.5) -> None:
+        """
+        Constructs all the necessary attributes for the TwoQ_Cache object.
+
+        Parameters:
+        -----------
+        capacity : int
+            The maximum number of items the cache can hold.
+        in_ratio : float
+            The share of the capacity A1in may keep for itself (default 0.25).
+        out_ratio : float
+            The number of ghost keys remembered, relative to the capacity (default 0.5).
+        """
+        self.capacity = capacity
+        self.in_capacity = max(1, int(capacity * in_ratio))
+        self.out_capacity = max(1, int(capacity * out_ratio))
+        self.a1in = OrderedDict()
+        self.a1out = OrderedDict()
+        self.am = OrderedDict()
+
+    def __len__(self) -> int:
+        """
+        Return the number of items currently stored.
+        """
+        return len(self.a1in) + len(self.am)
+
+    def _reclaim(self) -> None:
+        """
+        Free one slot if the cache is full, preferring A1in while it is over its share.
+        """
+        if len(self) < self.capacity:
+            return
+        if len(self.a1in) > self.in_capacity or not self.am:
+            key, _ = self.a1in.popitem(last=False)
+            self.a1out[key] = None
+            if len(self.a1out) > self.out_capacity:
+                self.a1out.popitem(last=False)
+        else:
+            self.am.popitem(last=False)
+
+    def get(self, key: int) -> Optional[Any]:
+        """
+        Get the value of the key if the key exists in the cache, otherwise return -1.
+
+        Parameters:
+        -----------
+        key : int
+            The key to be accessed in the cache.
+
+        Returns:
+        --------
+        Optional[Any]
+            The value associated with the key if it exists, otherwise -1.
+        """
+        if key in self.am:
+            self.am.move_to_end(key)
+            return self.am[key]
+        # A hit in A1in is deliberately not promoted, correlated references stay in the FIFO
+        return self.a1in.get(key, -1)
+
+    def set(self, key: int, value: Any) -> None:
+        """
+        Set or insert the value of the key. Keys remembered in A1out go straight to the
+        main LRU, other new keys enter A1in.
+
+        Parameters:
+        -----------
+        key : int
+            The key to be inserted or updated in the cache.
+        value : Any
+            The value to be associated with the key.
+        """
+        if self.capacity <= 0 or not isinstance(key, int):
+            return
+
+        if key in self.am:
+            self.am[key] = value
+            self.am.move_to_end(key)
+        elif key in self.a1in:
+            self.a1in[key] = value
+        elif key in self.a1out:
+            del self.a1out[key]
+            self._reclaim()
+            self.am[key] = value
+        else:
+            self._reclaim()
+            self.a1in[key] = value
+
+
+class ARC_Cache:
+    """
+    A cache using the Adaptive Replacement Cache policy (Megiddo and Modha).
+
+    T1 holds keys seen once recently and T2 keys seen at least twice; B1 and B2 remember
+    the keys recently evicted from each of them. A hit in a ghost list moves the target
+    size p of T1, so the cache adapts between recency and frequency on its own.
 
     Attributes:
     -----------
     capacity : int
         The maximum number of items the cache can hold.
-    cache : OrderedDict[int, Any]
-        The ordered dictionary to store cache items.
+    t1, t2 : OrderedDict[int, Any]
+        The LRU lists of stored entries seen once and more than once.
+    b1, b2 : OrderedDict[int, None]
+        The LRU ghost lists of keys evicted from t1 and t2.
+    p : float
+        The current target size of t1.
     """
 
     def __init__(self, capacity: int) -> None:
         """
-        Constructs all the necessary attributes for the LRU_Cache object.
+        Constructs all the necessary attributes for the ARC_Cache object.
 
         Parameters:
         -----------
@@ -23,7 +1104,28 @@ class LRU_Cache:
             The maximum number of items the cache can hold.
         """
         self.capacity = capacity
-        self.cache = OrderedDict()
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+        self.p = 0.0
+
+    def __len__(self) -> int:
+        """
+        Return the number of items currently stored.
+        """
+        return len(self.t1) + len(self.t2)
+
+    def _replace(self, in_b2: bool) -> None:
+        """
+        Evict the LRU entry of t1 or t2 into its ghost list, depending on the target p.
+        """
+        if self.t1 and ((in_b2 and len(self.t1) == self.p) or len(self.t1) > self.p):
+            key, _ = self.t1.popitem(last=False)
+            self.b1[key] = None
+        else:
+            key, _ = self.t2.popitem(last=False)
+            self.b2[key] = None
 
     def get(self, key: int) -> Optional[Any]:
         """
@@ -39,19 +1141,384 @@ class LRU_Cache:
         Optional[Any]
             The value associated with the key if it exists, otherwise -1.
         """
-        if key not in self.cache:
+        if key in self.t1:
+            value = self.t2[key] = self.t1.pop(key)
+            return value
+        if key in self.t2:
+            self.t2.move_to_end(key)
+            return self.t2[key]
+        return -1
+
+    def set(self, key: int, value: Any) -> None:
+        """
+        Set or insert the value of the key, adapting p when the key is found in a ghost list.
+
+        Parameters:
+        -----------
+        key : int
+            The key to be inserted or updated in the cache.
+        value : Any
+            The value to be associated with the key.
+        """
+        if self.capacity <= 0 or not isinstance(key, int):
+            return
+
+        if key in self.t1 or key in self.t2:
+            self.t1.pop(key, None)
+            self.t2.pop(key, None)
+            self.t2[key] = value
+        elif key in self.b1:
+            # Recency was undervalued, grow the target size of t1
+            self.p = min(self.capacity, self.p + max(len(self.b2) / len(self.b1), 1))
+            self._replace(in_b2=False)
+            del self.b1[key]
+            self.t2[key] = value
+        elif key in self.b2:
+            # Frequency was undervalued, shrink the target size of t1
+            self.p = max(0.0, self.p - max(len(self.b1) / len(self.b2), 1))
+            self._replace(in_b2=True)
+            del self.b2[key]
+            self.t2[key] = value
+        else:
+            if len(self.t1) + len(self.b1) == self.capacity:
+                if len(self.t1) < self.capacity:
+                    self.b1.popitem(last=False)
+                    self._replace(in_b2=False)
+                else:
+                    self.t1.popitem(last=False)
+            else:
+                total = len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2)
+                if total >= self.capacity:
+                    if total == 2 * self.capacity:
+                        self.b2.popitem(last=False)
+                    self._replace(in_b2=False)
+            self.t1[key] = value
+
+
+class Shared_LRU_Cache:
+    """
+    A cache for int keys and bytes values stored in shared memory, so that several
+    processes (e.g. pre-forked workers) share one cache with the LRU_Cache get/set contract.
+
+    Entries live in a fixed-size slot table, found through an open-addressing index,
+    and are evicted with the CLOCK approximation of LRU. All operations take one
+    process-safe lock.
+
+    Memory layout:
+    --------------
+    header : hand (int64), count (int64)
+    index  : index_size int32 slot numbers, -1 for an empty position
+    slots  : capacity x (key int64, reference bit uint8, value length uint32, value bytes)
+
+    Attributes:
+    -----------
+    capacity : int
+        The maximum number of items the cache can hold.
+    max_value_size : int
+        The maximum length of a value in bytes; longer values are not stored.
+    shm : shared_memory.SharedMemory
+        The shared memory block holding the cache.
+    lock : multiprocessing.Lock
+        The lock serializing access across processes.
+    """
+
+    HEADER = struct.Struct("<qq")
+    INDEX_ENTRY = struct.Struct("<i")
+    SLOT_HEADER = struct.Struct("<qBI")
+    KEY_MIN, KEY_MAX = -(1 << 63), (1 << 63) - 1
+
+    def __init__(self, capacity: int, max_value_size: int = 256, name: Optional[str] = None,
+                 create: bool = True, lock: Optional[Any] = None) -> None:
+        """
+        Constructs all the necessary attributes for the Shared_LRU_Cache object.
+
+        Parameters:
+        -----------
+        capacity : int
+            The maximum number of items the cache can hold.
+        max_value_size : int
+            The maximum length of a value in bytes (default 256).
+        name : Optional[str]
+            The name of the shared memory block (default: a random name when creating).
+        create : bool
+            Whether to create a new block or attach to an existing one (default True).
+        lock : Optional[Any]
+            The multiprocessing lock shared by all users of the block. Required to attach,
+            pass the creator's `lock` attribute (or pickle the cache itself to the child
+            process); a private lock would not exclude the other processes (default: a new
+            lock when creating).
+
+        Raises:
+        -------
+        ValueError
+            If capacity or max_value_size is negative, or if attaching without a lock.
+        """
+        if capacity < 0 or max_value_size < 0:
+            raise ValueError("capacity and max_value_size must not be negative.")
+        if not create and lock is None:
+            raise ValueError("Attaching to a shared cache requires the lock of the process that created it.")
+
+        self.capacity = capacity
+        self.max_value_size = max_value_size
+        self.lock = lock if lock is not None else multiprocessing.Lock()
+
+        # Keep the index at most half full so probe sequences stay short
+        self.index_size = 1 << max(2 * capacity - 1, 1).bit_length()
+        self.shift = 64 - (self.index_size.bit_length() - 1)   # Fibonacci hashing keeps the top bits
+        self.index_offset = self.HEADER.size
+        self.slots_offset = self.index_offset + self.index_size * self.INDEX_ENTRY.size
+        self.slot_size = self.SLOT_HEADER.size + max_value_size
+        size = self.slots_offset + capacity * self.slot_size
+
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size)
+        if create:
+            self.HEADER.pack_into(self.shm.buf, 0, 0, 0)
+            self.shm.buf[self.index_offset:self.slots_offset] = b"\xff" * (self.slots_offset - self.index_offset)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """
+        Pickle the cache as a reference to its shared memory block, so it can be passed to
+        child processes (e.g. as a multiprocessing.Process argument).
+        """
+        return {"capacity": self.capacity, "max_value_size": self.max_value_size,
+                "name": self.shm.name, "lock": self.lock}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """
+        Attach to the shared memory block of a pickled cache.
+        """
+        self.__init__(state["capacity"], state["max_value_size"], name=state["name"],
+                      create=False, lock=state["lock"])
+
+    def close(self) -> None:
+        """
+        Detach this process from the shared memory block.
+        """
+        self.shm.close()
+
+    def unlink(self) -> None:
+        """
+        Destroy the shared memory block; call once, from the process that created it.
+        """
+        self.shm.unlink()
+
+    def _is_valid_key(self, key: Any) -> bool:
+        """
+        Check the key is an int that fits in the int64 key field.
+        """
+        return isinstance(key, int) and self.KEY_MIN <= key <= self.KEY_MAX
+
+    def _home(self, key: int) -> int:
+        """
+        Return the preferred index position of the key (64-bit Fibonacci hashing).
+
+        The product is reduced mod 2**64 before taking its top bits, so every bit of the
+        key reaches the position and keys differing only in high bits do not cluster.
+        """
+        return (key * 0x9E3779B97F4A7C15 & 0xFFFFFFFFFFFFFFFF) >> self.shift
+
+    def _slot_key(self, slot: int) -> int:
+        """
+        Return the key stored in a slot.
+        """
+        return self.SLOT_HEADER.unpack_from(self.shm.buf, self.slots_offset + slot * self.slot_size)[0]
+
+    def _index_get(self, position: int) -> int:
+        return self.INDEX_ENTRY.unpack_from(self.shm.buf, self.index_offset + position * 4)[0]
+
+    def _index_set(self, position: int, slot: int) -> None:
+        self.INDEX_ENTRY.pack_into(self.shm.buf, self.index_offset + position * 4, slot)
+
+    def _find(self, key: int) -> tuple[int, int]:
+        """
+        Return (index position, slot) of the key, or (first empty position, -1) if it is absent.
+        """
+        mask = self.index_size - 1
+        position = self._home(key)
+        while True:
+            slot = self._index_get(position)
+            if slot == -1 or self._slot_key(slot) == key:
+                return position, slot
+            position = (position + 1) & mask
+
+    def _index_delete(self, position: int) -> None:
+        """
+        Remove an index entry with backward-shift deletion, so no tombstones are needed.
+        """
+        mask = self.index_size - 1
+        hole = position
+        position = (position + 1) & mask
+        while True:
+            slot = self._index_get(position)
+            if slot == -1:
+                break
+            home = self._home(self._slot_key(slot))
+            # Move the entry into the hole unless its home lies cyclically in (hole, position]
+            if (position - home) & mask >= (position - hole) & mask:
+                self._index_set(hole, slot)
+                hole = position
+            position = (position + 1) & mask
+        self._index_set(hole, -1)
+
+    def get(self, key: int) -> Optional[Any]:
+        """
+        Get the value of the key if the key exists in the cache, otherwise return -1.
+
+        Parameters:
+        -----------
+        key : int
+            The key to be accessed in the cache.
+
+        Returns:
+        --------
+        Optional[Any]
+            The bytes associated with the key if it exists, otherwise -1.
+        """
+        if self.capacity <= 0 or not self._is_valid_key(key):
             return -1
-        
-        # Since both "get" and "set" operations are considered as an "use operation"
-        # move the key that has just been used to the end, and return its value.
-        self.cache.move_to_end(key)
-        return self.cache[key]
+
+        with self.lock:
+            _, slot = self._find(key)
+            if slot == -1:
+                return -1
+
+            # Give the entry a second chance in the CLOCK sweep
+            offset = self.slots_offset + slot * self.slot_size
+            self.shm.buf[offset + 8] = 1
+            length = self.SLOT_HEADER.unpack_from(self.shm.buf, offset)[2]
+            start = offset + self.SLOT_HEADER.size
+            return bytes(self.shm.buf[start:start + length])
+
+    def set(self, key: int, value: bytes) -> None:
+        """
+        Set or insert the value of the key. When the cache reaches its capacity, the CLOCK
+        hand evicts the first entry not used since its last pass. Invalid keys, non-bytes
+        values and values longer than max_value_size are not stored.
+
+        Parameters:
+        -----------
+        key : int
+            The key to be inserted or updated in the cache.
+        value : bytes
+            The value to be associated with the key.
+        """
+        if self.capacity <= 0 or not self._is_valid_key(key):
+            return
+        if not isinstance(value, (bytes, bytearray, memoryview)) or len(value) > self.max_value_size:
+            return
+
+        with self.lock:
+            position, slot = self._find(key)
+            if slot == -1:
+                hand, count = self.HEADER.unpack_from(self.shm.buf, 0)
+                if count < self.capacity:
+                    slot = count
+                    count += 1
+                else:
+                    # CLOCK: clear reference bits until an entry without one is found
+                    while self.shm.buf[self.slots_offset + hand * self.slot_size + 8]:
+                        self.shm.buf[self.slots_offset + hand * self.slot_size + 8] = 0
+                        hand = (hand + 1) % self.capacity
+                    slot = hand
+                    hand = (hand + 1) % self.capacity
+                    self._index_delete(self._find(self._slot_key(slot))[0])
+                    position, _ = self._find(key)  # The deletion may have shifted entries
+                self.HEADER.pack_into(self.shm.buf, 0, hand, count)
+                self._index_set(position, slot)
+                reference = 0
+            else:
+                reference = 1
+
+            offset = self.slots_offset + slot * self.slot_size
+            self.SLOT_HEADER.pack_into(self.shm.buf, offset, key, reference, len(value))
+            start = offset + self.SLOT_HEADER.size
+            self.shm.buf[start:start + len(value)] = value
+
+    def __len__(self) -> int:
+        """
+        Return the number of items currently stored.
+        """
+        with self.lock:
+            return self.HEADER.unpack_from(self.shm.buf, 0)[1]
+
+
+def _shared_cache_worker(cache: Shared_LRU_Cache, first_key: int, count: int) -> None:
+    """
+    Fill a shared cache from a child process (used by the tests below).
+    """
+    for key in range(first_key, first_key + count):
+        cache.set(key, str(key).encode())
+    cache.close()
+
+
+class Sharded_LRU_Cache:
+    """
+    A thread-safe LRU cache that splits the key space across several independently
+    locked LRU_Cache shards (lock striping).
+
+    Attributes:
+    -----------
+    capacity : int
+        The maximum number of items the cache can hold across all shards.
+    shards : list[LRU_Cache]
+        The LRU caches holding each slice of the key space.
+    locks : list[threading.Lock]
+        One lock per shard, so threads touching different shards never wait on each other.
+    """
+
+    def __init__(self, capacity: int, num_shards: int = 16) -> None:
+        """
+        Constructs all the necessary attributes for the Sharded_LRU_Cache object.
+
+        Parameters:
+        -----------
+        capacity : int
+            The maximum number of items the cache can hold across all shards.
+        num_shards : int
+            The number of independently locked shards (default 16).
+        """
+        if num_shards < 1:
+            raise ValueError("num_shards must be at least 1.")
+
+        self.capacity = capacity
+        # Never create more shards than slots, otherwise some shards would have capacity 0
+        num_shards = max(1, min(num_shards, capacity))
+        base, extra = divmod(max(capacity, 0), num_shards)
+
+        # Spread the remainder over the first shards so the total matches the capacity
+        self.shards = [LRU_Cache(base + (1 if i < extra else 0)) for i in range(num_shards)]
+        self.locks = [threading.Lock() for _ in range(num_shards)]
+        # (lock, shard) pairs, so get and set find both with a single lookup
+        self._stripes = list(zip(self.locks, self.shards))
+
+    def _shard_index(self, key: int) -> int:
+        """
+        Return the index of the shard responsible for the given key.
+        """
+        return hash(key) % len(self.shards)
+
+    def get(self, key: int) -> Optional[Any]:
+        """
+        Get the value of the key if the key exists in the cache, otherwise return -1.
+
+        Parameters:
+        -----------
+        key : int
+            The key to be accessed in the cache.
+
+        Returns:
+        --------
+        Optional[Any]
+            The value associated with the key if it exists, otherwise -1.
+        """
+        lock, shard = self._stripes[hash(key) % len(self._stripes)]   # Inlined _shard_index
+        with lock:
+            return shard.get(key)
 
     def set(self, key: int, value: Any) -> None:
         """
-        Set or insert the value if the key is not already present. When the cache reaches 
-        its capacity, it should invalidate the least recently used item before inserting 
-        a new item.
+        Set or insert the value of the key. Eviction happens per shard: when the key's
+        shard is full, its least recently used item is invalidated first.
 
         Parameters:
         -----------
@@ -60,19 +1527,126 @@ class LRU_Cache:
         value : Any
             The value to be associated with the key.
         """
-        
-        # If capacity is bigger than 0 then set the key value
-        if self.capacity > 0:
-            # Check if key is valid
-            if isinstance(key, int):
-                if key in self.cache:
-                    # Move key to end
-                    self.cache.move_to_end(key)
-                elif len(self.cache) >= self.capacity:
-                    # Remove the least recently used item (first item in OrderedDict)
-                    self.cache.popitem(last=False)
-                # Add or update the key value
-                self.cache[key] = value
+        lock, shard = self._stripes[hash(key) % len(self._stripes)]
+        with lock:
+            shard.set(key, value)
+
+    def __len__(self) -> int:
+        """
+        Return the number of items currently stored across all shards.
+        """
+        return sum(len(shard.cache) for shard in self.shards)
+
+
+def _make_key(args: tuple, kwargs: dict) -> tuple:
+    """
+    Build a hashable key from the positional and keyword arguments of a call.
+    """
+    return (args, tuple(sorted(kwargs.items()))) if kwargs else (args,)
+
+
+def memoize(cache: Optional[Any] = None, capacity: int = 128) -> Callable[[Callable], Callable]:
+    """
+    Decorator caching the results of a function or coroutine function in an LRU cache.
+
+    Concurrent calls with the same arguments are deduplicated (single-flight): only the
+    first caller runs the function, the others wait for its result. Exceptions are
+    raised to every waiting caller and are never cached. A coroutine function runs in a
+    task of its own, so cancelling any caller, the first one included, only cancels that
+    caller: the call goes on for the others and is cached even if every caller is cancelled.
+
+    LRU_Cache only accepts int keys, so entries are stored under the hash of the call
+    arguments together with the arguments themselves, and a hash collision is treated
+    as a miss.
+
+    Parameters:
+    -----------
+    cache : Optional[Any]
+        The store to use, any object with the LRU_Cache get/set contract, e.g. a
+        TTL_LRU_Cache or a Sharded_LRU_Cache (default: a new LRU_Cache).
+    capacity : int
+        The capacity of the default LRU_Cache (default 128).
+
+    Returns:
+    --------
+    Callable[[Callable], Callable]
+        The decorator. The decorated function exposes the store as its `cache` attribute.
+    """
+    store = cache if cache is not None else LRU_Cache(capacity)
+
+    def lookup(key: tuple) -> tuple[bool, Any]:
+        entry = store.get(hash(key))
+        if entry != -1 and entry[0] == key:
+            return True, entry[1]
+        return False, None
+
+    def decorator(function: Callable) -> Callable:
+        if inspect.iscoroutinefunction(function):
+            pending = {}    # Key -> asyncio.Task of the call in flight
+
+            async def run(key: tuple, args: tuple, kwargs: dict) -> Any:
+                result = await function(*args, **kwargs)
+                store.set(hash(key), (key, result))
+                return result
+
+            def forget(key: tuple, task: asyncio.Task) -> None:
+                if pending.get(key) is task:
+                    del pending[key]
+
+            @functools.wraps(function)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                key = _make_key(args, kwargs)
+                found, result = lookup(key)
+                if found:
+                    return result
+
+                task = pending.get(key)
+                if task is None:
+                    # The call runs in its own task, so the first caller owns nothing more than the others
+                    task = pending[key] = asyncio.ensure_future(run(key, args, kwargs))
+                    task.add_done_callback(functools.partial(forget, key))
+                # Shield the shared task so a cancelled caller, the first one included, does not cancel the others
+                return await asyncio.shield(task)
+
+            async_wrapper.cache = store
+            return async_wrapper
+
+        pending = {}    # Key -> concurrent.futures.Future of the call in flight
+        lock = threading.Lock()
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key = _make_key(args, kwargs)
+            with lock:
+                found, result = lookup(key)
+                if found:
+                    return result
+                future = pending.get(key)
+                is_leader = future is None
+                if is_leader:
+                    future = pending[key] = concurrent.futures.Future()
+
+            if not is_leader:
+                return future.result()
+
+            try:
+                result = function(*args, **kwargs)
+            except BaseException as error:
+                future.set_exception(error)
+                raise
+            else:
+                with lock:
+                    store.set(hash(key), (key, result))
+                future.set_result(result)
+                return result
+            finally:
+                with lock:
+                    del pending[key]
+
+        wrapper.cache = store
+        return wrapper
+
+    return decorator
 
 
 if __name__ == '__main__':
@@ -121,3 +1695,378 @@ if __name__ == '__main__':
     assert test_4_cache.get(1) == 1     # Returns 1, the invalid key has not been stored in the cache
     test_4_cache.set(6, 6)              # This should evict key 2
     assert test_4_cache.get(2) == -1    # Returns -1, 2 was evicted
+
+    # Test Case 5: Sharded cache keeps the get/set contract
+    test_5_cache = Sharded_LRU_Cache(8, num_shards=4)
+    for i in range(8):
+        test_5_cache.set(i, i * 10)
+    assert all(test_5_cache.get(i) == i * 10 for i in range(8))
+    test_5_cache.set("", 1)             # Invalid key is ignored by the shard as well
+    assert len(test_5_cache) == 8
+    test_5_cache.set(8, 80)             # Shard of key 8 is full, evicts its LRU key (0)
+    assert test_5_cache.get(0) == -1
+    assert test_5_cache.get(8) == 80
+    assert len(test_5_cache) == 8
+    assert Sharded_LRU_Cache(0).get(1) == -1
+
+    # Test Case 6: Concurrent writers never exceed capacity
+    test_6_cache = Sharded_LRU_Cache(100, num_shards=8)
+
+    def worker(offset: int) -> None:
+        for i in range(2000):
+            test_6_cache.set(offset + i % 300, i)
+            test_6_cache.get(offset + (i * 7) % 300)
+
+    threads = [threading.Thread(target=worker, args=(t * 1000,)) for t in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(test_6_cache) <= 100
+
+    # Test Case 7: Weighted cache evicts by total weight
+    test_7_cache = Weighted_LRU_Cache(10, weigher=lambda key, value: len(value))
+    test_7_cache.set(1, "aaaa")         # weight 4
+    test_7_cache.set(2, "bbbb")         # weight 4, total 8
+    assert test_7_cache.get(1) == "aaaa"
+    test_7_cache.set(3, "ccc")          # weight 3, evicts key 2 (least recently used)
+    assert test_7_cache.get(2) == -1
+    assert test_7_cache.total_weight == 7
+    test_7_cache.set(1, "a")            # Updating a key replaces its weight
+    assert test_7_cache.total_weight == 4
+
+    # Test Case 8: Oversized entries are rejected without flushing the cache
+    test_7_cache.set(4, "x" * 11)
+    assert test_7_cache.get(4) == -1
+    assert test_7_cache.get(1) == "a" and test_7_cache.get(3) == "ccc"
+
+    # Test Case 9: Default weigher measures bytes
+    test_9_cache = Weighted_LRU_Cache(default_weigher(1, b"x" * 1000) * 2)
+    test_9_cache.set(1, b"x" * 1000)
+    test_9_cache.set(2, b"y" * 1000)
+    test_9_cache.set(3, b"z" * 1000)    # Budget holds two such entries, evicts key 1
+    assert test_9_cache.get(1) == -1 and test_9_cache.get(3) == b"z" * 1000
+
+    # Test Case 10: Entries expire after their TTL
+    fake_time = [0.0]
+    test_10_cache = TTL_LRU_Cache(5, default_ttl=10, wheel_size=8, clock=lambda: fake_time[0])
+    test_10_cache.set(1, 1)             # Expires at t=10
+    test_10_cache.set(2, 2, ttl=3)      # Expires at t=3
+    test_10_cache.set(3, 3, ttl=100)    # Expires at t=100, many revolutions of the wheel
+    fake_time[0] = 2.5
+    assert test_10_cache.get(2) == 2
+    fake_time[0] = 3.0
+    assert test_10_cache.get(2) == -1   # Returns -1, 2 has expired
+    assert test_10_cache.get(1) == 1
+
+    # Test Case 11: The timer wheel frees expired entries without a get
+    fake_time[0] = 20.0
+    test_10_cache.set(4, 4)
+    assert 1 not in test_10_cache.cache and 3 in test_10_cache.cache
+    fake_time[0] = 100.0
+    test_10_cache.set(5, 5)
+    assert 3 not in test_10_cache.cache
+
+    # Test Case 12: Re-setting a key replaces its TTL, LRU eviction still applies
+    fake_time[0] = 200.0
+    test_12_cache = TTL_LRU_Cache(2, clock=lambda: fake_time[0])
+    test_12_cache.set(1, 1, ttl=1)
+    test_12_cache.set(1, 1)             # No TTL any more
+    fake_time[0] = 300.0
+    assert test_12_cache.get(1) == 1
+    test_12_cache.set(2, 2, ttl=5)
+    test_12_cache.set(3, 3)             # Evicts key 1, the least recently used
+    assert test_12_cache.get(1) == -1 and test_12_cache.get(2) == 2
+    assert sum(len(slot) for slot in test_12_cache.wheel) == 1
+
+    # Test Case 13: TinyLFU keeps the LRU_Cache contract
+    test_13_cache = TinyLFU_Cache(5)
+    for i in range(1, 6):
+        test_13_cache.set(i, i)
+    assert all(test_13_cache.get(i) == i for i in range(1, 6))
+    test_13_cache.set("", 6)            # Invalid key is not stored
+    assert len(test_13_cache) == 5 and test_13_cache.get(9) == -1
+    test_13_cache.set(6, 6)
+    assert len(test_13_cache) == 5
+    test_13_cache.set(1, 100)           # Updating a stored key replaces its value
+    assert test_13_cache.get(1) == 100
+    test_13_cache_single = TinyLFU_Cache(1)
+    test_13_cache_single.set(1, 1)
+    test_13_cache_single.set(2, 2)
+    assert test_13_cache_single.get(1) == -1 and test_13_cache_single.get(2) == 2
+    assert TinyLFU_Cache(0).get(1) == -1
+
+    # Test Case 14: A scan of one-hit wonders does not flush the hot set
+    lru_cache, tinylfu_cache = LRU_Cache(100), TinyLFU_Cache(100)
+    lru_hits = tinylfu_hits = 0
+    for round_number in range(20):
+        for key in list(range(80)) + list(range(10_000 + round_number * 500, 10_500 + round_number * 500)):
+            for cache in (lru_cache, tinylfu_cache):
+                if cache.get(key) == -1:
+                    cache.set(key, key)
+                elif key < 80:
+                    if cache is lru_cache:
+                        lru_hits += 1
+                    else:
+                        tinylfu_hits += 1
+    assert tinylfu_hits > 10 * max(lru_hits, 1)
+
+    # Test Case 15: Statistics and eviction listener
+    evicted = []
+    test_15_cache = LRU_Cache(2, record_stats=True, on_evict=lambda key, value: evicted.append((key, value)))
+    test_15_cache.set(1, "a")
+    test_15_cache.set(2, "b")
+    test_15_cache.set(1, "c")           # Update, not an insertion
+    assert test_15_cache.get(1) == "c"
+    assert test_15_cache.get(3) == -1
+    test_15_cache.set(3, "d")           # Evicts key 2
+    stats = test_15_cache.stats.snapshot()
+    assert (stats["hits"], stats["misses"], stats["insertions"], stats["evictions"], stats["size"]) == (1, 1, 3, 1, 2)
+    assert evicted == [(2, "b")]
+    assert test_15_cache.stats.get_latency.count == 2 and test_15_cache.stats.set_latency.count == 4
+    assert LRU_Cache(1).stats is None and "get" not in LRU_Cache(1).__dict__
+
+    # Test Case 16: Subclasses report their evictions too
+    evicted = []
+    test_16_cache = Weighted_LRU_Cache(4, weigher=lambda key, value: 2, record_stats=True,
+                                       on_evict=lambda key, value: evicted.append(key))
+    for i in range(4):
+        test_16_cache.set(i, i)
+    assert evicted == [0, 1] and test_16_cache.stats.evictions == 2
+    test_16_ttl_cache = TTL_LRU_Cache(1, record_stats=True)
+    test_16_ttl_cache.set(1, 1, ttl=60)
+    test_16_ttl_cache.set(2, 2)
+    assert test_16_ttl_cache.stats.evictions == 1 and not test_16_ttl_cache.expires
+
+    # Test Case 17: Memoized function is computed once per distinct arguments
+    calls = []
+
+    @memoize(capacity=2)
+    def square(x: int, offset: int = 0) -> int:
+        calls.append(x)
+        return x * x + offset
+
+    assert square(3) == 9 and square(3) == 9 and calls == [3]
+    assert square(3, offset=1) == 10 and calls == [3, 3]
+    square(4)                           # Evicts square(3)
+    assert square(3) == 9 and calls == [3, 3, 4, 3]
+
+    # Test Case 18: Concurrent coroutine calls share one computation, failures are not cached
+    async_calls = []
+
+    @memoize()
+    async def fetch(key: str) -> str:
+        async_calls.append(key)
+        await asyncio.sleep(0.01)
+        if key == "bad":
+            raise KeyError(key)
+        return key.upper()
+
+    async def run_fetches() -> None:
+        results = await asyncio.gather(*(fetch("a") for _ in range(100)))
+        assert results == ["A"] * 100 and async_calls == ["a"]
+        errors = await asyncio.gather(*(fetch("bad") for _ in range(10)), return_exceptions=True)
+        assert all(isinstance(error, KeyError) for error in errors) and async_calls == ["a", "bad"]
+        try:
+            await fetch("bad")          # Recomputed, since the failure was not cached
+        except KeyError:
+            pass
+        assert async_calls == ["a", "bad", "bad"]
+
+    asyncio.run(run_fetches())
+
+    # Test Case 19: Concurrent threads share one computation
+    thread_calls = []
+
+    @memoize()
+    def slow(x: int) -> int:
+        thread_calls.append(x)
+        time.sleep(0.05)
+        return x + 1
+
+    threads = [threading.Thread(target=slow, args=(1,)) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert thread_calls == [1] and slow(1) == 2
+
+    # Test Case 20: Shared cache keeps the LRU_Cache contract with CLOCK eviction
+    test_20_cache = Shared_LRU_Cache(5, max_value_size=8)
+    for i in range(1, 5):
+        test_20_cache.set(i, bytes([i]))
+    assert test_20_cache.get(1) == b"\x01" and test_20_cache.get(2) == b"\x02"
+    assert test_20_cache.get(9) == -1
+    test_20_cache.set(5, b"5")
+    test_20_cache.set(6, b"6")          # Keys 1 and 2 get a second chance, evicts key 3
+    assert test_20_cache.get(3) == -1 and test_20_cache.get(6) == b"6"
+    test_20_cache.set("", b"x")         # Invalid key is not stored
+    test_20_cache.set(7, b"too long value")  # Oversized value is not stored
+    assert len(test_20_cache) == 5 and test_20_cache.get(7) == -1
+    test_20_cache.set(1, b"one")        # Updating a key replaces its value
+    assert test_20_cache.get(1) == b"one"
+    for i in range(100, 1100):          # Heavy churn keeps the index consistent
+        test_20_cache.set(i, b"v")
+        assert test_20_cache.get(i) == b"v"
+    assert len(test_20_cache) == 5 and sum(test_20_cache.get(i) == b"v" for i in range(1095, 1100)) == 5
+    test_20_cache.close()
+    test_20_cache.unlink()
+
+    # Test Case 21: Several processes share one cache
+    test_21_cache = Shared_LRU_Cache(1000, max_value_size=16)
+    processes = [multiprocessing.Process(target=_shared_cache_worker, args=(test_21_cache, p * 100, 100))
+                 for p in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert len(test_21_cache) == 400
+    assert all(test_21_cache.get(key) == str(key).encode() for key in range(400))
+    test_21_cache.close()
+    test_21_cache.unlink()
+
+    # Test Case 22: Compact CLOCK cache keeps the LRU_Cache contract
+    test_22_cache = Compact_CLOCK_Cache(5)
+    for i in range(1, 5):
+        test_22_cache.set(i, i)
+    assert test_22_cache.get(1) == 1 and test_22_cache.get(2) == 2
+    assert test_22_cache.get(9) == -1
+    test_22_cache.set(5, 5)
+    test_22_cache.set(6, 6)             # Keys 1 and 2 get a second chance, evicts key 3
+    assert test_22_cache.get(3) == -1 and test_22_cache.get(6) == 6
+    test_22_cache.set("", 6)            # Invalid key is not stored
+    assert len(test_22_cache) == 5
+    for i in range(-500, 500):          # Heavy churn keeps the index consistent
+        test_22_cache.set(i * 7919, i)
+        assert test_22_cache.get(i * 7919) == i
+    assert sum(test_22_cache.get(i * 7919) == i for i in range(495, 500)) == 5
+    test_22_cache_empty = Compact_CLOCK_Cache(0)
+    test_22_cache_empty.set(1, 1)
+    assert test_22_cache_empty.get(1) == -1
+
+    # Test Case 23: Alternative policies keep the LRU_Cache contract
+    for policy in (FIFO_Cache, TwoQ_Cache, ARC_Cache):
+        test_23_cache = policy(5)
+        for i in range(1, 6):
+            test_23_cache.set(i, i)
+        assert all(test_23_cache.get(i) == i for i in range(1, 6)), policy.__name__
+        test_23_cache.set("", 6)        # Invalid key is not stored
+        assert test_23_cache.get(9) == -1
+        for i in range(6, 100):         # Size never exceeds the capacity
+            test_23_cache.set(i, i)
+            assert test_23_cache.get(i) == i and len(test_23_cache) <= 5
+        test_23_cache.set(99, 0)        # Updating a stored key replaces its value
+        assert test_23_cache.get(99) == 0
+        test_23_cache_empty = policy(0)
+        test_23_cache_empty.set(1, 1)
+        assert test_23_cache_empty.get(1) == -1
+
+    # Test Case 24: FIFO ignores recency, ARC and 2Q survive a scan
+    test_24_cache = FIFO_Cache(2)
+    test_24_cache.set(1, 1)
+    test_24_cache.set(2, 2)
+    test_24_cache.get(1)
+    test_24_cache.set(3, 3)             # Evicts key 1 although it was just used
+    assert test_24_cache.get(1) == -1 and test_24_cache.get(2) == 2
+    for policy in (TwoQ_Cache, ARC_Cache):
+        test_24_cache = policy(10)
+        for round_number in range(5):   # Make keys 0-4 frequent, between small scans
+            for i in list(range(5)) + list(range(1000 + 5 * round_number, 1005 + 5 * round_number)):
+                if test_24_cache.get(i) == -1:
+                    test_24_cache.set(i, i)
+        for i in range(100, 200):       # One-time scan
+            test_24_cache.set(i, i)
+        assert all(test_24_cache.get(i) == i for i in range(5)), policy.__name__
+
+    # Test Case 25: The timer wheel frees entries expiring in the middle of a tick
+    fake_time[0] = 0.0
+    test_25_cache = TTL_LRU_Cache(100, default_ttl=2.5, clock=lambda: fake_time[0])
+    for i in range(10):
+        test_25_cache.set(i, i)         # Every key expires at t=2.5, half way through tick 2
+    for step in range(1, 100):
+        fake_time[0] = step / 10
+        test_25_cache.get(1000)         # Only misses, no lazy expiry of the stored keys
+        if fake_time[0] < 2.5:
+            assert len(test_25_cache.cache) == 10
+        elif fake_time[0] >= 3.0:
+            assert len(test_25_cache.cache) == 0, fake_time[0]
+    assert not test_25_cache.expires and not any(test_25_cache.wheel)
+
+    # Test Case 26: A negative TTL is rejected instead of landing in an already swept slot
+    test_26_cache = TTL_LRU_Cache(5, clock=lambda: fake_time[0])
+    test_26_cache.set(1, 1)
+    for bad_ttl in (-1, -0.5):
+        try:
+            test_26_cache.set(1, 2, ttl=bad_ttl)
+            assert False, "a negative ttl should raise ValueError"
+        except ValueError:
+            pass
+    assert test_26_cache.get(1) == 1 and not test_26_cache.expires    # Nothing changed
+    test_26_cache.set(2, 2, ttl=0)      # Zero is valid and expires at once
+    assert test_26_cache.get(2) == -1
+    try:
+        TTL_LRU_Cache(5, default_ttl=-1)
+        assert False, "a negative default_ttl should raise ValueError"
+    except ValueError:
+        pass
+
+    # Test Case 27: Cancelling the first caller of a coroutine does not fail the waiters
+    cancel_calls = []
+
+    @memoize()
+    async def lookup_user(user_id: int) -> str:
+        cancel_calls.append(user_id)
+        await asyncio.sleep(0.02)
+        return f"user-{user_id}"
+
+    async def cancel_leader() -> None:
+        leader = asyncio.ensure_future(lookup_user(7))
+        await asyncio.sleep(0)          # The leader starts the call
+        waiters = [asyncio.ensure_future(lookup_user(7)) for _ in range(5)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        assert await asyncio.gather(*waiters) == ["user-7"] * 5
+        assert leader.cancelled() and cancel_calls == [7]
+
+        # Even with every caller cancelled, the call completes and is cached
+        lone = asyncio.ensure_future(lookup_user(8))
+        await asyncio.sleep(0)
+        lone.cancel()
+        await asyncio.sleep(0.05)
+        assert await lookup_user(8) == "user-8" and cancel_calls == [7, 8]
+
+    asyncio.run(cancel_leader())
+
+    # Test Case 28: Keys differing only in their high bits spread over the shared index
+    test_28_cache = Shared_LRU_Cache(3000, max_value_size=8)
+    high_keys = [i << 48 for i in range(3000)] + [-(i << 40) for i in range(1, 3000)]
+    assert len({test_28_cache._home(key) for key in high_keys[:3000]}) > 2000
+    for key in high_keys:
+        test_28_cache.set(key, b"v")
+    assert len(test_28_cache) == 3000 and all(test_28_cache.get(key) == b"v" for key in high_keys[-3000:])
+    test_28_cache.close()
+    test_28_cache.unlink()
+
+    # Test Case 29: Attaching to a shared cache needs the creator's lock
+    test_29_cache = Shared_LRU_Cache(10, max_value_size=8)
+    try:
+        Shared_LRU_Cache(10, max_value_size=8, name=test_29_cache.shm.name, create=False)
+        assert False, "attaching without a lock should raise ValueError"
+    except ValueError:
+        pass
+    attached = Shared_LRU_Cache(10, max_value_size=8, name=test_29_cache.shm.name, create=False,
+                                lock=test_29_cache.lock)
+    attached.set(1, b"one")
+    assert test_29_cache.get(1) == b"one" and attached.lock is test_29_cache.lock
+    attached.close()
+    test_29_cache.close()
+    test_29_cache.unlink()
+
+    # Test Case 30: Compact cache keys differing only above bit 32 spread over the index
+    test_30_cache = Compact_CLOCK_Cache(10_000)
+    high_keys = [i << 32 for i in range(10_000)]
+    assert len({test_30_cache._home(key) for key in high_keys}) > 6000
+    for key in high_keys + [-(i << 40) for i in range(1, 5000)]:
+        test_30_cache.set(key, key)
+        assert test_30_cache.get(key) == key
+    assert len(test_30_cache) == 10_000
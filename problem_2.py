@@ -1,6 +1,370 @@
+import ctypes
+import ctypes.util
+import errno
+import fnmatch
+import itertools
+import mmap
 import os
+import re
+import select
+import struct
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Iterable, Iterator, Optional
 
-def find_files(suffix: str, path: str) -> list[str]:
+def _compile_exclude(patterns: Iterable[str]) -> Optional[re.Pattern]:
+    """
+    Compile glob patterns for names to exclude into one regex, None if there are none.
+    """
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns))
+
+
+def _scan_directory(suffix: str, path: str, exclude: Optional[re.Pattern] = None) \
+        -> tuple[list[str], list[tuple[str, tuple[int, int]]]]:
+    """
+    List one directory, returning the matching files and the subdirectories to explore,
+    each with its (st_dev, st_ino) identity. Entries whose name matches exclude are skipped,
+    so excluded directories are never listed.
+    """
+    match_all = suffix == ".*"
+    files, subdirs = [], []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if exclude is not None and exclude.match(entry.name):
+                continue
+            if entry.is_file():
+                if match_all or entry.name.endswith(suffix):
+                    files.append(entry.path)
+            elif entry.is_dir():
+                stat = entry.stat()     # One stat per directory, none per file
+                subdirs.append((entry.path, (stat.st_dev, stat.st_ino)))
+    return files, subdirs
+
+
+def _identity(path: str) -> tuple[int, int]:
+    """
+    Return the (st_dev, st_ino) pair identifying a directory, following symlinks.
+    """
+    stat = os.stat(path)
+    return stat.st_dev, stat.st_ino
+
+
+def _iter_files_parallel(suffix: str, path: str, workers: int, exclude: Optional[re.Pattern],
+                         max_depth: Optional[int]) -> Iterator[str]:
+    """
+    Yield the matching files, listing up to `workers` directories concurrently.
+
+    Every directory is a task of a thread pool; as each listing completes, its matches are
+    yielded and its subdirectories submitted, so the pool never waits for a whole level.
+    Loops are detected against each directory's own ancestors, like the serial traversal,
+    so both visit exactly the same paths whatever the completion order.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Future -> (depth, identities of the directory and its ancestors)
+        pending = {executor.submit(_scan_directory, suffix, path, exclude): (0, frozenset([_identity(path)]))}
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    depth, ancestors = pending.pop(future)
+                    files, subdirs = future.result()
+                    if max_depth is None or depth < max_depth:
+                        for subdir, identity in subdirs:
+                            if identity not in ancestors:   # Skip symlink loops
+                                pending[executor.submit(_scan_directory, suffix, subdir, exclude)] = \
+                                    (depth + 1, ancestors | {identity})
+                    yield from files
+        finally:
+            # Stop early if the caller closes the generator or a listing fails
+            for future in pending:
+                future.cancel()
+
+
+def iter_files(suffix: str, path: str, workers: int = 1, exclude: Iterable[str] = (),
+               max_depth: Optional[int] = None, limit: Optional[int] = None) -> Iterator[str]:
+    """
+    Lazily yield the files within the given directory (including subdirectories)
+    that end with the specified suffix, as soon as they are found and in no particular order.
+
+    Uses os.scandir, whose DirEntry objects carry the file type read with the directory
+    listing, so no extra stat call is needed per file on most platforms. Each directory
+    is stat-ed once, and a subdirectory with the same st_dev and st_ino as one of its
+    ancestors (a symlink loop) is not entered. A directory reached through several paths,
+    e.g. a symlink alias, is listed under each of them, like the original find_files.
+
+    Parameters:
+    -----------
+    suffix : str
+        The file extension or suffix to filter files by (e.g., ".txt"), or ".*" for all files.
+    path : str
+        The root directory path where the search begins.
+    workers : int
+        The number of directories listed concurrently by a thread pool (default 1, serial).
+        Worth raising on high-latency filesystems such as NFS, where listing is I/O bound.
+    exclude : Iterable[str]
+        Glob patterns of file and directory names to skip (e.g. ".git", "node_modules");
+        excluded directories are pruned without being listed (default none).
+    max_depth : Optional[int]
+        The deepest level of subdirectories to explore, 0 for the root directory only
+        (default None, no limit).
+    limit : Optional[int]
+        Stop after yielding this many files (default None, no limit).
+
+    Returns:
+    --------
+    Iterator[str]
+        The paths of the files that match the suffix.
+    """
+    if limit is not None and limit <= 0:
+        return
+    exclude = _compile_exclude(exclude)
+
+    if workers > 1:
+        files = _iter_files_parallel(suffix, path, workers, exclude, max_depth)
+    else:
+        files = _iter_files_serial(suffix, path, exclude, max_depth)
+
+    # Stopping the generator early also stops the traversal
+    yield from itertools.islice(files, limit)
+
+
+def _iter_files_serial(suffix: str, path: str, exclude: Optional[re.Pattern],
+                       max_depth: Optional[int]) -> Iterator[str]:
+    """
+    Yield the matching files, listing one directory at a time in depth-first order.
+    """
+    # Using a stack to implement Depth-First Search (DFS), each directory with the
+    # identities of itself and its ancestors
+    stack = [(path, 0, frozenset([_identity(path)]))]
+
+    while stack:
+        current_path, depth, ancestors = stack.pop()   # Retrieve the last inserted directory (LIFO order)
+        files, subdirs = _scan_directory(suffix, current_path, exclude)
+        yield from files
+
+        if max_depth is None or depth < max_depth:
+            for subdir, identity in subdirs:
+                if identity not in ancestors:   # Skip symlink loops
+                    stack.append((subdir, depth + 1, ancestors | {identity}))
+
+
+class FileIndex:
+    """
+    A persistent index of a directory tree, storing for every directory its modification
+    time and entries, so that repeated searches do not re-list unchanged directories.
+
+    A directory's mtime changes whenever an entry is added, removed or renamed in it, so
+    refresh only needs one stat per directory, and re-lists just the directories whose
+    mtime changed.
+
+    File format (little-endian):
+    ----------------------------
+    header    : magic b"FIDX", version (uint16), number of directories (uint32), byte length
+                (uint32) of the absolute root path, followed by that UTF-8 string
+    directory : mtime_ns (int64), then the byte lengths (uint32) of its relative path, of its
+                NUL-separated file names and of its NUL-separated subdirectory names,
+                followed by those three UTF-8 strings
+
+    Attributes:
+    -----------
+    root : str
+        The root directory of the indexed tree.
+    directories : dict[str, tuple[int, list[str], list[str]]]
+        Relative directory path -> (mtime_ns, file names, subdirectory names).
+    listed : int
+        The number of directories actually listed by the last refresh.
+    """
+
+    MAGIC = b"FIDX"
+    VERSION = 2
+    HEADER = struct.Struct("<4sHII")
+    RECORD = struct.Struct("<qIII")
+    UNSTABLE_NS = 2_000_000_000     # mtimes this recent may hide changes in the same tick
+
+    def __init__(self, root: str) -> None:
+        """
+        Constructs all the necessary attributes for the FileIndex object.
+
+        Parameters:
+        -----------
+        root : str
+            The root directory of the indexed tree.
+        """
+        self.root = root
+        self.directories = {}
+        self.listed = 0
+
+    def refresh(self) -> None:
+        """
+        Bring the index up to date, re-listing only the directories whose mtime changed.
+        Directories that disappeared are dropped, new ones are listed.
+        """
+        old_directories = self.directories
+        self.directories = {}
+        self.listed = 0
+        unstable_after = time.time_ns() - self.UNSTABLE_NS
+        # Each directory with its full path and the identities of its ancestors
+        stack = [("", self.root, frozenset())]
+
+        while stack:
+            relative, full_path, ancestors = stack.pop()
+            try:
+                stat = os.stat(full_path)
+            except OSError:
+                continue    # Removed since its parent was listed, or a symlink to a removed target
+            identity = (stat.st_dev, stat.st_ino)
+            if identity in ancestors:
+                continue    # A symlink loop back to an ancestor
+            mtime = stat.st_mtime_ns
+            record = old_directories.get(relative)
+
+            if record is None or record[0] != mtime or mtime < 0:
+                try:
+                    files, subdirs = _scan_directory(".*", full_path)
+                except OSError:
+                    continue    # Removed between the stat and the listing
+                files = [os.path.basename(file) for file in files]
+                subdirs = [os.path.basename(subdir) for subdir, _ in subdirs]
+                # A directory modified very recently may change again within the same
+                # mtime tick, so store it as unknown (-1) to list it again next time
+                record = (mtime if mtime < unstable_after else -1, files, subdirs)
+                self.listed += 1
+
+            self.directories[relative] = record
+            if record[2]:
+                # Join each prefix once per directory, not per subdirectory: the joins cost more than the stats
+                relative_prefix, full_prefix = os.path.join(relative, ""), os.path.join(full_path, "")
+                ancestors = ancestors | {identity}
+                stack.extend((relative_prefix + subdir, full_prefix + subdir, ancestors) for subdir in record[2])
+
+    def find_files(self, suffix: str) -> list[str]:
+        """
+        Return the sorted list of indexed files that end with the suffix (".*" for all
+        files), without touching the filesystem.
+
+        Parameters:
+        -----------
+        suffix : str
+            The file extension or suffix to filter files by.
+
+        Returns:
+        --------
+        list[str]
+            The paths of the matching files, built like those of find_files.
+        """
+        match_all = suffix == ".*"
+        result = []
+        for relative, (_, files, _) in self.directories.items():
+            prefix = os.path.join(self.root, relative, "")     # Join once per directory, not per file
+            if match_all:
+                result.extend(map(prefix.__add__, files))
+            else:
+                result.extend([prefix + name for name in files if name.endswith(suffix)])
+        return sorted(result)
+
+    def save(self, index_path: str) -> None:
+        """
+        Write the index to a file, atomically replacing any previous version.
+
+        Parameters:
+        -----------
+        index_path : str
+            The path of the index file.
+        """
+        root = os.path.abspath(self.root).encode("utf-8", "surrogateescape")
+        parts = [self.HEADER.pack(self.MAGIC, self.VERSION, len(self.directories), len(root)), root]
+        for relative, (mtime, files, subdirs) in self.directories.items():
+            strings = [text.encode("utf-8", "surrogateescape")
+                       for text in (relative, "\0".join(files), "\0".join(subdirs))]
+            parts.append(self.RECORD.pack(mtime, *map(len, strings)))
+            parts.extend(strings)
+
+        temporary_path = index_path + ".tmp"
+        with open(temporary_path, "wb") as index_file:
+            index_file.write(b"".join(parts))
+        os.replace(temporary_path, index_path)
+
+    @classmethod
+    def load(cls, index_path: str, root: str) -> 'FileIndex':
+        """
+        Read an index file through a memory mapping, without copying it into a buffer first.
+
+        Parameters:
+        -----------
+        index_path : str
+            The path of the index file.
+        root : str
+            The root directory the index describes.
+
+        Returns:
+        --------
+        FileIndex
+            The loaded index; call refresh before relying on it.
+
+        Raises:
+        -------
+        ValueError
+            If the file is not a file index of this version, or describes another root.
+        """
+        index = cls(root)
+        with open(index_path, "rb") as index_file, \
+                mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            magic, version, count, root_length = cls.HEADER.unpack_from(data, 0)
+            if magic != cls.MAGIC or version != cls.VERSION:
+                raise ValueError(f"'{index_path}' is not a version {cls.VERSION} file index.")
+            offset = cls.HEADER.size + root_length
+            # Relative paths could match in another tree, serving its stale listings
+            indexed_root = data[cls.HEADER.size:offset].decode("utf-8", "surrogateescape")
+            if indexed_root != os.path.abspath(root):
+                raise ValueError(f"'{index_path}' indexes '{indexed_root}', not '{os.path.abspath(root)}'.")
+
+            for _ in range(count):
+                mtime, *lengths = cls.RECORD.unpack_from(data, offset)
+                offset += cls.RECORD.size
+                strings = []
+                for length in lengths:
+                    strings.append(data[offset:offset + length].decode("utf-8", "surrogateescape"))
+                    offset += length
+                relative, files, subdirs = strings
+                index.directories[relative] = (mtime, files.split("\0") if files else [],
+                                               subdirs.split("\0") if subdirs else [])
+        return index
+
+
+def _is_valid_search(path: str, workers: int, max_depth: Optional[int] = None, limit: Optional[int] = None) -> bool:
+    """
+    Check the search root and options, printing an error if they are invalid.
+    """
+    # Check the path exists and is a string
+    if not isinstance(path, str) or not os.path.exists(path):
+        print(f"Error: The path '{path}' does not exist.")
+        return False
+
+    # Check the path is a directory
+    if not os.path.isdir(path):
+        print(f"Error: The path '{path}' is not a directory.")
+        return False
+
+    # Check the number of workers is a positive integer
+    if not isinstance(workers, int) or workers < 1:
+        print("Error: workers must be a positive integer.")
+        return False
+
+    # Check the depth and match limits are non-negative integers when given
+    for name, value in (("max_depth", max_depth), ("limit", limit)):
+        if value is not None and (not isinstance(value, int) or value < 0):
+            print(f"Error: {name} must be a non-negative integer.")
+            return False
+
+    return True
+
+
+def find_files(suffix: str, path: str, workers: int = 1, index_path: Optional[str] = None,
+               exclude: Iterable[str] = (), max_depth: Optional[int] = None, limit: Optional[int] = None) -> list[str]:
     """
     Recursively finds all files within the given directory (including subdirectories)
     that end with the specified suffix.
@@ -11,6 +375,20 @@ def find_files(suffix: str, path: str) -> list[str]:
         The file extension or suffix to filter files by (e.g., ".txt").
     path : str
         The root directory path where the search begins.
+    workers : int
+        The number of directories listed concurrently (default 1, serial).
+    index_path : Optional[str]
+        A FileIndex file to answer from and keep up to date; only directories whose
+        mtime changed since the last call are listed again (default None, no index).
+    exclude : Iterable[str]
+        Glob patterns of file and directory names to skip; excluded directories are
+        pruned without being listed (default none).
+    max_depth : Optional[int]
+        The deepest level of subdirectories to explore, 0 for the root directory only
+        (default None, no limit).
+    limit : Optional[int]
+        Stop the search after this many matches; the result holds the first files found,
+        sorted, not the first in sorted order (default None, no limit).
 
     Returns:
     --------
@@ -23,33 +401,387 @@ def find_files(suffix: str, path: str) -> list[str]:
         print("Error: Suffix must be a non-empty string.")
         return None  # Return None for invalid input
     
-    # Check the path exists and is a string
-    if not isinstance(path, str) or not os.path.exists(path):
-        print(f"Error: The path '{path}' does not exist.")
+    if not _is_valid_search(path, workers, max_depth, limit):
         return None
 
-    # Check the path is a directory
-    if not os.path.isdir(path):
-        print(f"Error: The path '{path}' is not a directory.")
+    if index_path is not None:
+        # The index always covers the whole tree
+        if exclude or max_depth is not None or limit is not None:
+            print("Error: index_path cannot be combined with exclude, max_depth or limit.")
+            return None
+
+        try:
+            index = FileIndex.load(index_path, path)
+        except (OSError, ValueError, struct.error):
+            index = FileIndex(path)     # Missing, unreadable or for another root, start from scratch
+        index.refresh()
+        # Any added or removed entry changes its parent's mtime, so nothing listed means no change
+        if index.listed:
+            index.save(index_path)
+        return index.find_files(suffix)
+
+    # Return a sorted list of matching files
+    return sorted(iter_files(suffix, path, workers, exclude, max_depth, limit))
+
+
+class PatternMatcher:
+    """
+    Matches file paths against many suffixes and glob patterns at once.
+
+    Plain suffixes are stored reversed in a trie, so all the suffixes of a path are found
+    in one walk over its last characters, whatever their number. Glob patterns (containing
+    *, ? or [) are matched against the file name, behind one precompiled regex that
+    rejects most names in a single call. As in find_files, ".*" matches every file.
+
+    Attributes:
+    -----------
+    patterns : list[str]
+        The patterns, in the order they were given.
+    """
+
+    _TERMINAL = ""   # Trie key holding the suffixes ending at a node (never a path character)
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        """
+        Constructs all the necessary attributes for the PatternMatcher object.
+
+        Parameters:
+        -----------
+        patterns : Iterable[str]
+            The suffixes and glob patterns to match.
+        """
+        self.patterns = list(dict.fromkeys(patterns))   # Drop duplicates, keep the order
+        self.match_all = [pattern for pattern in self.patterns if pattern == ".*"]
+        self.trie = {}
+        self.globs = []
+
+        for pattern in self.patterns:
+            if pattern == ".*":
+                continue
+            if any(char in pattern for char in "*?["):
+                self.globs.append((pattern, re.compile(fnmatch.translate(pattern))))
+                continue
+            node = self.trie
+            for char in reversed(pattern):
+                node = node.setdefault(char, {})
+            node.setdefault(self._TERMINAL, []).append(pattern)
+
+        self.any_glob = None
+        if self.globs:
+            self.any_glob = re.compile("|".join(f"(?:{regex.pattern})" for _, regex in self.globs))
+
+    def match(self, path: str) -> list[str]:
+        """
+        Return the patterns matching a file path.
+
+        Parameters:
+        -----------
+        path : str
+            The path of the file.
+
+        Returns:
+        --------
+        list[str]
+            The matching patterns, possibly empty.
+        """
+        matches = list(self.match_all)
+
+        node = self.trie
+        for char in reversed(path):
+            node = node.get(char)
+            if node is None:
+                break
+            if self._TERMINAL in node:
+                matches.extend(node[self._TERMINAL])
+
+        if self.any_glob is not None:
+            name = os.path.basename(path)
+            if self.any_glob.match(name):
+                matches.extend(pattern for pattern, regex in self.globs if regex.match(name))
+        return matches
+
+
+def find_files_multi(patterns: Iterable[str], path: str, workers: int = 1, exclude: Iterable[str] = (),
+                     max_depth: Optional[int] = None) -> dict[str, list[str]]:
+    """
+    Find the files matching any of several suffixes or glob patterns in a single traversal.
+
+    Parameters:
+    -----------
+    patterns : Iterable[str]
+        The suffixes (e.g. ".c"), glob patterns matched against file names (e.g. "test_*.py"),
+        or ".*" for all files.
+    path : str
+        The root directory path where the search begins.
+    workers : int
+        The number of directories listed concurrently (default 1, serial).
+    exclude : Iterable[str]
+        Glob patterns of file and directory names to skip (default none).
+    max_depth : Optional[int]
+        The deepest level of subdirectories to explore (default None, no limit).
+
+    Returns:
+    --------
+    dict[str, list[str]]
+        Each pattern mapped to the sorted list of file paths matching it.
+    """
+    patterns = list(patterns) if not isinstance(patterns, str) else None
+
+    # Check the patterns are non-empty strings
+    if not patterns or not all(isinstance(pattern, str) and pattern for pattern in patterns):
+        print("Error: Patterns must be a non-empty list of non-empty strings.")
         return None
-    
-    result = []  # List to store file paths
-    stack = [path]  # Using a stack to implement Depth-First Search (DFS)
 
-    while stack:
-        current_path = stack.pop()  # Retrieve the last inserted directory (LIFO order)
+    if not _is_valid_search(path, workers, max_depth):
+        return None
 
-        for item in os.listdir(current_path):  # Iterate over the items in the directory
-            full_path = os.path.join(current_path, item)  # Get the full path of the item
+    matcher = PatternMatcher(patterns)
+    result = {pattern: [] for pattern in matcher.patterns}
+    for file_path in iter_files(".*", path, workers, exclude, max_depth):
+        for pattern in matcher.match(file_path):
+            result[pattern].append(file_path)
 
-            if os.path.isfile(full_path) and (full_path.endswith(suffix) or suffix == ".*"):
-                # If it's a file and matches the given suffix, add it to results
-                result.append(full_path)
-            elif os.path.isdir(full_path):
-                # If it's a directory, add it to the stack for further exploration
-                stack.append(full_path)
-    
-    return sorted(result)  # Return a sorted list of matching files
+    for files in result.values():
+        files.sort()
+    return result
+
+
+class FileWatcher:
+    """
+    Keeps the set of files matching a suffix up to date through Linux inotify events,
+    after one initial walk, instead of re-walking the tree to notice changes.
+
+    Every directory of the tree gets an inotify watch. New directories are watched (and
+    scanned, for files created before the watch existed) as soon as they appear, and an
+    event queue overflow triggers a full resynchronization.
+
+    As in find_files, a directory reached through several paths (a symlink alias) is
+    listed under each of them, and a symlink back to an ancestor is not followed. inotify
+    gives such a directory a single watch, whose events are applied to every alias path.
+    Symlinks are resolved when their directory is scanned: a symlink created later, or
+    whose target moves away, is only picked up by the next resynchronization.
+
+    Attributes:
+    -----------
+    suffix : str
+        The file extension or suffix to filter files by, or ".*" for all files.
+    path : str
+        The root directory being watched.
+    files : set[str]
+        The paths of the matching files currently present.
+    """
+
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = os.O_NONBLOCK
+    IN_CLOEXEC = os.O_CLOEXEC
+    WATCH_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+    EVENT = struct.Struct("iIII")   # wd, mask, cookie, length of the name that follows
+
+    def __init__(self, suffix: str, path: str, exclude: Iterable[str] = ()) -> None:
+        """
+        Constructs all the necessary attributes for the FileWatcher object and performs
+        the initial walk.
+
+        Parameters:
+        -----------
+        suffix : str
+            The file extension or suffix to filter files by, or ".*" for all files.
+        path : str
+            The root directory to watch.
+        exclude : Iterable[str]
+            Glob patterns of file and directory names to ignore (default none).
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("FileWatcher relies on inotify, which is only available on Linux.")
+
+        self.suffix = suffix
+        self.path = path
+        self.exclude = _compile_exclude(exclude)
+        self.files = set()
+        self._watches = {}  # Watch descriptor -> every path the directory is reached through
+        self._paths = {}    # Directory path -> (watch descriptor, descriptors of it and its ancestors)
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            self._raise_errno("inotify_init1")
+        self._scan_tree(path)
+
+    def __enter__(self) -> 'FileWatcher':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Release the inotify file descriptor and all its watches.
+        """
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _raise_errno(self, function: str) -> None:
+        code = ctypes.get_errno()
+        raise OSError(code, f"{function}: {os.strerror(code)}")
+
+    def _matches(self, file_path: str) -> bool:
+        return self.suffix == ".*" or file_path.endswith(self.suffix)
+
+    def _add_watch(self, directory: str) -> int:
+        """
+        Watch a directory, returning its watch descriptor, or -1 if it vanished. A directory
+        reached through several paths always gets the same descriptor.
+        """
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.WATCH_MASK)
+        if wd < 0:
+            if ctypes.get_errno() in (errno.ENOENT, errno.ENOTDIR):
+                return -1       # Removed before we could watch it
+            self._raise_errno("inotify_add_watch")
+        return wd
+
+    def _scan_tree(self, root: str, ancestors: frozenset = frozenset()) -> list[str]:
+        """
+        Watch every directory under root and record its matching files, returning the new ones.
+        Each directory is watched before it is listed, so no file can slip between the two.
+        ancestors holds the watch descriptors of the directories above root.
+        """
+        added = []
+        stack = [(root, ancestors)]
+        while stack:
+            directory, ancestors = stack.pop()
+            if directory in self._paths:
+                continue        # Already watched under this path
+            wd = self._add_watch(directory)
+            if wd < 0 or wd in ancestors:
+                continue        # Vanished, or a symlink loop back to an ancestor
+            ancestors = ancestors | {wd}
+            self._watches.setdefault(wd, []).append(directory)
+            self._paths[directory] = (wd, ancestors)
+            try:
+                files, subdirs = _scan_directory(self.suffix, directory, self.exclude)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            for file_path in files:
+                if file_path not in self.files:
+                    self.files.add(file_path)
+                    added.append(file_path)
+            stack.extend((subdir, ancestors) for subdir, _ in subdirs)
+        return added
+
+    def _forget_tree(self, root: str) -> list[str]:
+        """
+        Stop watching a removed or moved-away directory and drop its files, returning them.
+        A directory still reached through another alias path keeps its watch.
+        """
+        prefix = os.path.join(root, "")
+        for directory in [d for d in self._paths if d == root or d.startswith(prefix)]:
+            wd, _ = self._paths.pop(directory)
+            aliases = self._watches.get(wd)
+            if aliases is not None:
+                aliases.remove(directory)
+                if not aliases:
+                    del self._watches[wd]
+                    self._libc.inotify_rm_watch(self._fd, wd)   # Fails harmlessly if already gone
+        removed = [file_path for file_path in self.files if file_path.startswith(prefix)]
+        self.files.difference_update(removed)
+        return removed
+
+    def _resync(self) -> list[tuple[str, str]]:
+        """
+        Rebuild everything with a full walk, after the kernel dropped events.
+        """
+        old_files = self.files
+        for wd in self._watches:
+            self._libc.inotify_rm_watch(self._fd, wd)
+        self._watches, self._paths, self.files = {}, {}, set()
+        self._scan_tree(self.path)
+        return ([("removed", file_path) for file_path in sorted(old_files - self.files)] +
+                [("added", file_path) for file_path in sorted(self.files - old_files)])
+
+    def poll(self, timeout: Optional[float] = 0) -> list[tuple[str, str]]:
+        """
+        Apply the pending inotify events and return the resulting changes to the file set.
+
+        Parameters:
+        -----------
+        timeout : Optional[float]
+            How long to wait for events in seconds, 0 to return at once, None to block.
+
+        Returns:
+        --------
+        list[tuple[str, str]]
+            ("added" or "removed", file path) pairs, in the order they happened.
+        """
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return []
+
+        changes = []
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+                offset += self.EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+
+                if mask & self.IN_Q_OVERFLOW:
+                    changes.extend(self._resync())
+                    continue
+                if mask & self.IN_IGNORED:
+                    # The directory is gone: drop whatever is still listed under its paths
+                    for directory in self._watches.pop(wd, ()):
+                        changes.extend(("removed", file_path) for file_path in sorted(self._forget_tree(directory)))
+                    continue
+
+                if not name or (self.exclude is not None and self.exclude.match(name)):
+                    continue
+                for directory in list(self._watches.get(wd, ())):    # The event applies to every alias
+                    if directory in self._paths:
+                        changes.extend(self._apply_event(directory, name, mask))
+        return changes
+
+    def _apply_event(self, directory: str, name: str, mask: int) -> list[tuple[str, str]]:
+        """
+        Apply one inotify event about the entry name of a directory, reached through the
+        given path, and return the resulting changes.
+        """
+        entry_path = os.path.join(directory, name)
+        if mask & self.IN_ISDIR:
+            if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                return [("added", file_path) for file_path in self._scan_tree(entry_path, self._paths[directory][1])]
+            if mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                return [("removed", file_path) for file_path in sorted(self._forget_tree(entry_path))]
+        elif mask & (self.IN_CREATE | self.IN_MOVED_TO):
+            if self._matches(entry_path) and entry_path not in self.files:
+                self.files.add(entry_path)
+                return [("added", entry_path)]
+        elif mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+            if entry_path in self.files:
+                self.files.remove(entry_path)
+                return [("removed", entry_path)]
+        return []
+
+    def events(self) -> Iterator[tuple[str, str]]:
+        """
+        Block and yield ("added" or "removed", file path) changes as they happen, forever.
+        """
+        while True:
+            yield from self.poll(timeout=None)
 
 
 def test_find_files(suffix, path, expected_output):
@@ -104,3 +836,197 @@ if __name__ == "__main__":
     path = "./problem_2.py"
     expected_output = None
     test_find_files(suffix, path, expected_output)
+
+    # Test Case 6: iter_files yields the same files lazily
+    print("Test Case 6: Lazy iteration")
+    files = iter_files(".h", "./testdir")
+    assert next(files).endswith(".h")
+    assert sorted(iter_files(".h", "./testdir")) == ["./testdir/subdir1/a.h", "./testdir/subdir3/subsubdir1/b.h",
+                                                    "./testdir/subdir5/a.h", "./testdir/t1.h"]
+    print("\033[92m****    ****    Pass    ****    ****\033[0m\n")
+
+    # Test Case 7: Parallel traversal returns the same files as the serial one
+    print("Test Case 7: Parallel traversal")
+    for suffix in (".c", ".h", ".*"):
+        assert find_files(suffix, "./testdir", workers=4) == find_files(suffix, "./testdir")
+    assert find_files(".c", "./testdir", workers=0) is None
+    print("\033[92m****    ****    Pass    ****    ****\033[0m\n")
+
+    # Test Case 8: The persistent index answers like a walk and only re-lists changed directories
+    print("Test Case 8: Persistent file index")
+    import shutil
+    import tempfile
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        tree = os.path.join(temporary_dir, "testdir")
+        shutil.copytree("./testdir", tree)
+        index_file = os.path.join(temporary_dir, "files.idx")
+        for suffix in (".c", ".h", ".*"):
+            assert find_files(suffix, tree, index_path=index_file) == find_files(suffix, tree)
+
+        for directory, _, _ in os.walk(tree):   # Age the tree, so its mtimes are trusted
+            os.utime(directory, ns=(0, 10**18))
+        index = FileIndex(tree)
+        index.refresh()
+        index.save(index_file)
+        index = FileIndex.load(index_file, tree)
+        index.refresh()
+        assert index.listed == 0
+
+        open(os.path.join(tree, "subdir2", "new.c"), "w").close()
+        os.utime(os.path.join(tree, "subdir2"), ns=(0, 2 * 10**18))
+        index.refresh()
+        assert index.listed == 1
+        assert index.find_files(".c") == find_files(".c", tree)
+    print("\033[92m****    ****    Pass    ****    ****\033[0m\n")
+
+    # Test Case 9: Many suffixes and glob patterns in one traversal
+    print("Test Case 9: Multi-pattern search")
+    patterns = [".c", ".h", "a.*", "b.?", "1.c", ".*", "*.py"]
+    result = find_files_multi(patterns, "./testdir")
+    for pattern in (".c", ".h", "1.c", ".*"):
+        assert result[pattern] == find_files(pattern, "./testdir")
+    assert result["a.*"] == ["./testdir/subdir1/a.c", "./testdir/subdir1/a.h", "./testdir/subdir5/a.c", "./testdir/subdir5/a.h"]
+    assert result["b.?"] == ["./testdir/subdir3/subsubdir1/b.c", "./testdir/subdir3/subsubdir1/b.h"]
+    assert result["*.py"] == []
+    assert find_files_multi([], "./testdir") is None and find_files_multi([".c", ""], "./testdir") is None
+    print("\033[92m****    ****    Pass    ****    ****\033[0m\n")
+
+    # Test Case 10: Pruning, depth limit, match limit and symlink loops
+    print("Test Case 10: Pruning and early termination")
+    assert find_files(".c", "./testdir", exclude=["subdir[13]"]) == ["./testdir/subdir5/a.c", "./testdir/t1.c"]
+    assert find_files(".*", "./testdir", exclude=[".gitkeep", "*.h"]) == find_files(".c", "./testdir")
+    assert find_files(".c", "./testdir", max_depth=0) == ["./testdir/t1.c"]
+    assert find_files(".c", "./testdir", max_depth=1) == ["./testdir/subdir1/a.c", "./testdir/subdir5/a.c", "./testdir/t1.c"]
+    assert len(find_files(".*", "./testdir", limit=3)) == 3 and find_files(".*", "./testdir", limit=0) == []
+    assert len(find_files(".*", "./testdir", workers=4, limit=3)) == 3
+    assert find_files(".c", "./testdir", max_depth=-1) is None
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        os.makedirs(os.path.join(temporary_dir, "a", "b"))
+        open(os.path.join(temporary_dir, "a", "b", "x.c"), "w").close()
+        os.symlink(os.path.join(temporary_dir, "a"), os.path.join(temporary_dir, "a", "b", "loop"))
+        expected_output = [os.path.join(temporary_dir, "a", "b", "x.c")]
+        assert find_files(".c", temporary_dir) == expected_output
+        assert find_files(".c", temporary_dir, workers=4) == expected_output
+        index = FileIndex(temporary_dir)
+        index.refresh()
+        assert index.find_files(".c") == expected_output
+    print("\033[92m****    ****    Pass    ****    ****\033[0m\n")
+
+    # Test Case 11: Watch mode keeps the file set current
+    print("Test Case 11: Watch mode")
+    if sys.platform.startswith("linux"):
+        with tempfile.TemporaryDirectory() as temporary_dir, FileWatcher(".c", temporary_dir) as watcher:
+            assert watcher.files == set()
+            new_file = os.path.join(temporary_dir, "new.c")
+            open(new_file, "w").close()
+            open(os.path.join(temporary_dir, "new.h"), "w").close()
+            assert watcher.poll(timeout=1) == [("added", new_file)]
+
+            subdir = os.path.join(temporary_dir, "sub")
+            os.makedirs(os.path.join(subdir, "deeper"))
+            nested_file = os.path.join(subdir, "deeper", "nested.c")
+            watcher.poll(timeout=1)
+            open(nested_file, "w").close()
+            watcher.poll(timeout=1)
+            assert watcher.files == {new_file, nested_file} == set(find_files(".c", temporary_dir))
+
+            moved_dir = os.path.join(temporary_dir, "moved")
+            os.rename(subdir, moved_dir)
+            os.remove(new_file)
+            changes = watcher.poll(timeout=1)
+            assert ("removed", nested_file) in changes and ("removed", new_file) in changes
+            assert ("added", os.path.join(moved_dir, "deeper", "nested.c")) in changes
+            assert watcher.files == set(find_files(".c", temporary_dir))
+        print("\033[92m****    ****    Pass    ****    ****\033[0m\n")
+
+    # Test Case 12: The index drops directories that disappeared behind a cached listing
+    print("Test Case 12: File index with a dangling directory symlink")
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        tree, outside = os.path.join(temporary_dir, "root"), os.path.join(temporary_dir, "outside")
+        os.makedirs(os.path.join(tree, "a"))
+        os.makedirs(os.path.join(outside, "d"))
+        open(os.path.join(tree, "a", "x.c"), "w").close()
+        open(os.path.join(outside, "d", "y.c"), "w").close()
+        os.symlink(os.path.join(outside, "d"), os.path.join(tree, "a", "link"))
+        for directory in (tree, os.path.join(tree, "a")):   # Old mtimes, so listings are reused
+            os.utime(directory, ns=(0, 10**18))
+        index = FileIndex(tree)
+        index.refresh()
+        assert index.find_files(".c") == [os.path.join(tree, "a", "link", "y.c"), os.path.join(tree, "a", "x.c")]
+
+        shutil.rmtree(os.path.join(outside, "d"))  # Leaves the mtime of a unchanged
+        index.refresh()
+        assert index.listed == 0
+        assert index.find_files(".c") == [os.path.join(tree, "a", "x.c")] == find_files(".c", tree)
+    print("\033[92m****    ****    Pass    ****    ****\033[0m\n")
+
+    # Test Case 13: A directory reached through a symlink alias is listed under every path
+    print("Test Case 13: Symlink aliases in serial, parallel and indexed traversals")
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        target = os.path.join(temporary_dir, "a", "b", "c", "target")
+        os.makedirs(target)
+        os.makedirs(os.path.join(temporary_dir, "z"))
+        open(os.path.join(target, "x.c"), "w").close()
+        os.symlink(target, os.path.join(temporary_dir, "z", "link"))
+        os.symlink(temporary_dir, os.path.join(target, "loop"))     # And a loop back to the root
+        expected_output = [os.path.join(target, "x.c"), os.path.join(temporary_dir, "z", "link", "x.c")]
+        assert find_files(".c", temporary_dir) == expected_output
+        for _ in range(10):
+            assert find_files(".c", temporary_dir, workers=8) == expected_output
+        index = FileIndex(temporary_dir)
+        index.refresh()
+        assert index.find_files(".c") == expected_output
+    print("\033[92m****    ****    Pass    ****    ****\033[0m\n")
+
+    # Test Case 14: An index file reused for another root is rebuilt, not served stale
+    print("Test Case 14: File index reused for another root")
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        trees = [os.path.join(temporary_dir, name) for name in ("first", "second")]
+        for tree, file_name in zip(trees, ("one.c", "two.c")):
+            os.makedirs(os.path.join(tree, "src"))
+            open(os.path.join(tree, "src", file_name), "w").close()
+            for directory in (tree, os.path.join(tree, "src")):    # Same names and mtimes in both trees
+                os.utime(directory, ns=(0, 10**18))
+        index_file = os.path.join(temporary_dir, "files.idx")
+        assert find_files(".c", trees[0], index_path=index_file) == [os.path.join(trees[0], "src", "one.c")]
+        try:
+            FileIndex.load(index_file, trees[1])
+            assert False, "loading an index for another root should raise ValueError"
+        except ValueError:
+            pass
+        assert find_files(".c", trees[1], index_path=index_file) == [os.path.join(trees[1], "src", "two.c")]
+        assert FileIndex.load(index_file, trees[1] + "/").root == trees[1] + "/"   # Same root, other spelling
+    print("\033[92m****    ****    Pass    ****    ****\033[0m\n")
+
+    # Test Case 15: The watcher lists a directory under every symlink alias, like find_files
+    print("Test Case 15: Watch mode with symlink aliases")
+    if sys.platform.startswith("linux"):
+        with tempfile.TemporaryDirectory() as temporary_dir:
+            target = os.path.join(temporary_dir, "a", "target")
+            alias = os.path.join(temporary_dir, "z", "link")
+            os.makedirs(target)
+            os.makedirs(os.path.dirname(alias))
+            open(os.path.join(target, "x.c"), "w").close()
+            os.symlink(target, alias)
+            os.symlink(temporary_dir, os.path.join(target, "loop"))     # And a loop back to the root
+            with FileWatcher(".c", temporary_dir) as watcher:
+                assert watcher.files == set(find_files(".c", temporary_dir))
+                assert watcher.files == {os.path.join(target, "x.c"), os.path.join(alias, "x.c")}
+
+                open(os.path.join(target, "y.c"), "w").close()
+                os.makedirs(os.path.join(target, "sub"))
+                watcher.poll(timeout=1)
+                open(os.path.join(target, "sub", "z.c"), "w").close()
+                changes = watcher.poll(timeout=1)
+                assert ("added", os.path.join(alias, "sub", "z.c")) in changes
+                assert watcher.files == set(find_files(".c", temporary_dir))
+                assert len(watcher.files) == 6
+
+                os.remove(os.path.join(target, "x.c"))
+                shutil.rmtree(os.path.join(target, "sub"))
+                changes = watcher.poll(timeout=1)
+                assert ("removed", os.path.join(alias, "x.c")) in changes
+                assert ("removed", os.path.join(alias, "sub", "z.c")) in changes
+                assert watcher.files == set(find_files(".c", temporary_dir))
+                assert watcher.files == {os.path.join(target, "y.c"), os.path.join(alias, "y.c")}
+        print("\033[92m****    ****    Pass    ****    ****\033[0m\n")
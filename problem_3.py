@@ -1,6 +1,20 @@
+import array
 import heapq
-from collections import defaultdict
-from typing import Optional
+import io
+import mmap
+import os
+import struct
+import sys
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from operator import itemgetter
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional
+
+try:
+    import numpy as np
+except ImportError:     # Optional: bytes input falls back to the pure Python coder
+    np = None
 
 # Huffman Tree Node
 class HuffmanNode:
@@ -72,6 +86,27 @@ def calculate_frequencies(data: str) -> dict[str, int]:
     return dict(frequency)
 
 
+def byte_frequencies(data: bytes) -> dict[str, int]:
+    """
+    Calculate the frequency of each byte, keyed by the characters chr(0) to chr(255) so the
+    result can be fed to build_huffman_tree. Counts with np.bincount when NumPy is installed.
+
+    Parameters:
+    -----------
+    data : bytes
+        The input bytes for which frequencies are calculated.
+
+    Returns:
+    --------
+    Dict[str, int]
+        A dictionary with characters as keys and their frequencies as values.
+    """
+    if np is None:
+        return {chr(byte): count for byte, count in Counter(data).items()}
+    counts = np.bincount(np.frombuffer(data, np.uint8), minlength=256)
+    return {chr(byte): int(counts[byte]) for byte in np.flatnonzero(counts)}
+
+
 def build_huffman_tree(frequency: dict[str, int]) -> HuffmanNode:
     """
     Build the Huffman Tree based on the character frequencies.
@@ -131,39 +166,490 @@ def generate_huffman_codes(node: Optional[HuffmanNode], code: str, huffman_codes
     generate_huffman_codes(node.right, code + "1", huffman_codes)
 
 
-def huffman_encoding(data: str) -> tuple[str, Optional[HuffmanNode]]:
+def _huffman_codes(data: str) -> tuple[Optional[HuffmanNode], dict[str, str]]:
     """
-    Encode the given data using Huffman coding.
+    Build the Huffman Tree of the data and the code of each character.
 
     Parameters:
     -----------
     data : str
-        The input string to be encoded.
+        The non-empty input string.
 
     Returns:
     --------
-    Tuple[str, Optional[HuffmanNode]]
-        A tuple containing the encoded string and the root of the Huffman Tree.
+    Tuple[Optional[HuffmanNode], Dict[str, str]]
+        The root of the Huffman Tree and the dictionary of Huffman codes.
     """
-    if  data is None or not data:   # Edge case: Handle empty or None input
-        return "", None
-    
     frequency = calculate_frequencies(data) # Calculate character frequencies
     root = build_huffman_tree(frequency)    # Build Huffman Tree
     huffman_codes = {}
-    
+
     # Edge case: If only one unique character exists, assign the code "0" as its code
     if len(frequency) == 1:
         only_char = next(iter(frequency))
         huffman_codes[only_char] = "0"
     else:
         generate_huffman_codes(root, "", huffman_codes) # Generate Huffman codes
+    return root, huffman_codes
+
+
+def huffman_encoding(data: str) -> tuple[str, Optional[HuffmanNode]]:
+    """
+    Encode the given data using Huffman coding.
+
+    Parameters:
+    -----------
+    data : str
+        The input string to be encoded.
+
+    Returns:
+    --------
+    Tuple[str, Optional[HuffmanNode]]
+        A tuple containing the encoded string and the root of the Huffman Tree.
+    """
+    if  data is None or not data:   # Edge case: Handle empty or None input
+        return "", None
+    
+    root, huffman_codes = _huffman_codes(data)
 
     # Encode data by replacing characters with their Huffman codes
     encoded_data = "".join(huffman_codes[char] for char in data)
     return encoded_data, root
 
 
+PACK_CHUNK_SIZE = 65536     # Characters encoded per step when packing bits
+BYTE_PACK_CHUNK_SIZE = 1 << 20  # Bytes encoded per vectorized step, must be even
+
+
+class BitPacker:
+    """
+    Packs Huffman codes into bytes (most significant bit first) across any number of
+    calls, carrying the bits that do not fill a whole byte over to the next call.
+
+    Attributes:
+    -----------
+    huffman_codes : Dict[str, str]
+        The code of each character.
+    bit_length : int
+        The number of bits packed so far.
+    """
+
+    def __init__(self, huffman_codes: dict[str, str]) -> None:
+        """
+        Constructs all the necessary attributes for the BitPacker object.
+
+        Parameters:
+        -----------
+        huffman_codes : Dict[str, str]
+            The code of each character.
+        """
+        self.huffman_codes = huffman_codes
+        self.bit_length = 0
+        self.carry = ""     # Bits left over from the previous call, fewer than 8
+        self.pair_tables = None     # Built by pack_bytes on first use
+
+    def pack(self, data: str) -> bytes:
+        """
+        Encode data and return the whole bytes produced so far.
+
+        The data is encoded chunk by chunk, so the temporary '0'/'1' string never exceeds
+        one chunk, whatever the size of the input.
+        """
+        packed = bytearray()
+        for start in range(0, len(data), PACK_CHUNK_SIZE):
+            bits = self.carry + "".join(map(self.huffman_codes.__getitem__, data[start:start + PACK_CHUNK_SIZE]))
+            self.bit_length += len(bits) - len(self.carry)
+            whole = len(bits) - len(bits) % 8
+            if whole:
+                # int() parses power-of-two bases in linear time, so this is O(chunk)
+                packed += int(bits[:whole], 2).to_bytes(whole // 8, "big")
+            self.carry = bits[whole:]
+        return bytes(packed)
+
+    def _build_pair_tables(self) -> None:
+        """
+        Build the NumPy tables of pack_bytes, indexed by two input bytes at once: the
+        length of their two codes, and the codes left-aligned in a 64-bit word.
+        """
+        lengths = np.zeros(256, np.uint64)
+        values = np.zeros(256, np.uint64)
+        for char, code in self.huffman_codes.items():
+            lengths[ord(char)] = len(code)
+            values[ord(char)] = int(code, 2)
+        first, second = np.divmod(np.arange(1 << 16), 256)
+        pair_lengths = lengths[first] + lengths[second]
+        pair_values = values[first] << lengths[second] | values[second]
+        self.pair_tables = (pair_lengths, pair_values << (np.uint64(64) - pair_lengths))
+
+    def _pack_pairs(self, data: bytes) -> bytes:
+        """
+        Vectorized packing of an even number of bytes, after the pending carry bits.
+
+        Each pair of bytes is coded by table lookups, its bit offset is a cumulative sum of
+        the code lengths, and the codes are shifted into 64-bit words: the codes starting
+        in the same word are OR-ed together with reduceat, and the last one may spill into
+        the next word.
+        """
+        pair_lengths, pair_codes = self.pair_tables
+        symbols = np.frombuffer(data, ">u2")
+        lengths = pair_lengths[symbols]
+        ends = np.cumsum(lengths) + np.uint64(len(self.carry))
+        starts = ends - lengths
+        shifts = starts & np.uint64(63)
+        words = (starts >> np.uint64(6)).astype(np.intp)
+        codes = pair_codes[symbols]
+        total = int(ends[-1])
+
+        packed = np.zeros((total >> 6) + 2, np.uint64)
+        if self.carry:
+            packed[0] = np.uint64(int(self.carry, 2) << (64 - len(self.carry)))
+        boundaries = np.flatnonzero(words[1:] != words[:-1]) + 1
+        firsts = np.concatenate(([0], boundaries))
+        lasts = np.concatenate((boundaries - 1, [len(symbols) - 1]))
+        packed[words[firsts]] |= np.bitwise_or.reduceat(codes >> shifts, firsts)
+        packed[words[lasts] + 1] |= codes[lasts] << (np.uint64(64) - shifts[lasts])   # 0 if no spill
+
+        whole, remainder = divmod(total, 8)
+        packed = packed.astype(">u8").tobytes()     # Big-endian words, the first bits in the first byte
+        self.bit_length += total - len(self.carry)
+        self.carry = format(packed[whole], "08b")[:remainder] if remainder else ""
+        return packed[:whole]
+
+    def pack_bytes(self, data: bytes) -> bytes:
+        """
+        Encode bytes, coded as the characters chr(0) to chr(255), and return the whole
+        bytes produced so far. Same output as pack(data.decode("latin-1")), vectorized
+        with NumPy when it is installed and every code fits in 32 bits.
+        """
+        if np is None or max(map(len, self.huffman_codes.values()), default=0) > 32 or len(data) < 2:
+            return self.pack(data.decode("latin-1"))
+        if self.pair_tables is None:
+            self._build_pair_tables()
+        packed = bytearray()
+        even = len(data) - len(data) % 2
+        for start in range(0, even, BYTE_PACK_CHUNK_SIZE):
+            packed += self._pack_pairs(data[start:min(start + BYTE_PACK_CHUNK_SIZE, even)])
+        return bytes(packed + self.pack(data[even:].decode("latin-1")))
+
+    def flush(self) -> bytes:
+        """
+        Return the last, zero-padded byte if some bits are still pending.
+        """
+        if not self.carry:
+            return b""
+        last_byte = bytes([int(self.carry.ljust(8, "0"), 2)])
+        self.carry = ""
+        return last_byte
+
+
+def pack_codes(data: str, huffman_codes: dict[str, str]) -> tuple[bytes, int]:
+    """
+    Encode the data with the given codes, packing 8 bits per byte (most significant bit first).
+
+    Parameters:
+    -----------
+    data : str
+        The input string to be encoded.
+    huffman_codes : Dict[str, str]
+        The code of each character.
+
+    Returns:
+    --------
+    Tuple[bytes, int]
+        The packed bits, zero-padded to a whole byte, and the number of meaningful bits.
+    """
+    packer = BitPacker(huffman_codes)
+    packed = packer.pack(data) + packer.flush()
+    return packed, packer.bit_length
+
+
+def huffman_encoding_packed(data: str) -> tuple[bytes, int, Optional[HuffmanNode]]:
+    """
+    Encode the given data using Huffman coding, with the bits packed into bytes.
+
+    Parameters:
+    -----------
+    data : str
+        The input string to be encoded.
+
+    Returns:
+    --------
+    Tuple[bytes, int, Optional[HuffmanNode]]
+        The packed bits, the number of meaningful bits and the root of the Huffman Tree.
+    """
+    if data is None or not data:    # Edge case: Handle empty or None input
+        return b"", 0, None
+
+    root, huffman_codes = _huffman_codes(data)
+    packed, bit_length = pack_codes(data, huffman_codes)
+    return packed, bit_length, root
+
+
+DECODE_TABLE_BITS = 12      # Default number of bits looked up at once by the table-driven decoder
+TABLE_DECODE_MIN_BITS = 1 << 14     # Below this, building the table costs more than it saves
+MAX_TABLE_BITS = 14         # Widest table built by table_bits_for and the single-lookup fast path
+UNPACK_CHUNK_SIZE = 65536   # Packed bytes split into 64-bit pieces per step when decoding
+
+
+def build_decode_table(huffman_codes: dict[str, str], table_bits: int = DECODE_TABLE_BITS) -> list[tuple[str, int]]:
+    """
+    Precompute what every table_bits-bit prefix of the input decodes to.
+
+    Each entry holds every character completely decoded within those bits, so a single
+    lookup often yields several characters. An entry whose first code is longer than
+    table_bits decodes nothing (it consumes 0 bits), and the decoder falls back to
+    matching longer prefixes against the codes.
+
+    The table for w bits is built from the tables for fewer bits: the first code of a
+    prefix is found in a single-code table, and the rest of the prefix was already decoded
+    by the table for the remaining bits. This takes O(2 ** table_bits) steps in total.
+
+    Parameters:
+    -----------
+    huffman_codes : Dict[str, str]
+        The code of each character.
+    table_bits : int
+        The number of bits looked up at once (default DECODE_TABLE_BITS).
+
+    Returns:
+    --------
+    List[Tuple[str, int]]
+        The (decoded characters, bits consumed) entry of every table_bits-bit value.
+    """
+    # Single-code table: the first code of every table_bits-bit value, if short enough
+    first_code = [None] * (1 << table_bits)
+    for char, code in huffman_codes.items():
+        if len(code) <= table_bits:
+            start = int(code, 2) << (table_bits - len(code))
+            for value in range(start, start + (1 << (table_bits - len(code)))):
+                first_code[value] = (char, len(code))
+
+    tables = [[("", 0)]]    # tables[w][value] = (characters, bits consumed) for w-bit values
+    for width in range(1, table_bits + 1):
+        table = []
+        for value in range(1 << width):
+            entry = first_code[value << (table_bits - width)]
+            if entry is None or entry[1] > width:
+                table.append(("", 0))
+            else:
+                char, length = entry
+                rest_width = width - length
+                chars, consumed = tables[rest_width][value & ((1 << rest_width) - 1)]
+                table.append((char + chars, length + consumed))
+        tables.append(table)
+
+    return tables[table_bits]
+
+
+def table_bits_for(bit_length: int, max_code_length: int = 0) -> int:
+    """
+    Choose the table size for an input: wider tables decode more bits per lookup, but take
+    O(2 ** table_bits) to build, which only pays off on long inputs.
+
+    When every code fits in MAX_TABLE_BITS bits (see limited_code_lengths), the table is
+    widened to the longest code so that every lookup decodes, but only if the input has
+    at least 16 bits per table entry to repay the build; short inputs keep the size-based
+    width and let the fallback handle the longer codes.
+    """
+    table_bits = min(MAX_TABLE_BITS, max(8, bit_length.bit_length() - 8))
+    if table_bits < max_code_length <= MAX_TABLE_BITS and bit_length >= 16 << max_code_length:
+        return max_code_length
+    return table_bits
+
+
+DECODE_YIELD_PIECES = 4096  # Bit buffer refills between two yields of iter_decode_pieces
+
+
+def _iter_packed_pieces(chunks: Iterable[bytes], bit_length: int) -> Iterator[tuple[int, int]]:
+    """
+    Split packed data (most significant bit first), given in chunks of any size, into
+    (value, width) pieces of at most 64 bits, dropping the padding after bit_length bits.
+    """
+    remaining = bit_length
+    carry = b""
+    for chunk in chunks:
+        data = carry + chunk
+        whole = len(data) - len(data) % 8
+        words = array.array("Q", data[:whole])
+        if sys.byteorder == "little":
+            words.byteswap()    # The first byte holds the first bits
+        for word in words:
+            if remaining < 64:
+                if remaining:
+                    yield word >> (64 - remaining), remaining
+                return
+            yield word, 64
+            remaining -= 64
+        carry = data[whole:]
+
+    width = min(len(carry) * 8, remaining)
+    if width:
+        yield int.from_bytes(carry, "big") >> (len(carry) * 8 - width), width
+
+
+def _iter_bit_string_pieces(bit_strings: Iterable[str]) -> Iterator[tuple[int, int]]:
+    """
+    Split '0'/'1' strings, given in chunks of any size, into (value, width) pieces of at most 64 bits.
+    """
+    for bits in bit_strings:
+        if not bits:
+            continue
+        # int() parses base 2 in linear time, then the words are split off in C
+        padding = -len(bits) % 64
+        words = array.array("Q", (int(bits, 2) << padding).to_bytes((len(bits) + padding) // 8, "big"))
+        if sys.byteorder == "little":
+            words.byteswap()
+        last = words.pop()
+        for word in words:
+            yield word, 64
+        yield last >> padding, 64 - padding
+
+
+def iter_decode_pieces(pieces: Iterable[tuple[int, int]], huffman_codes: dict[str, str],
+                       table_bits: int = DECODE_TABLE_BITS) -> Iterator[str]:
+    """
+    Decode a stream of (value, width) bit pieces with a table-driven decoder, yielding the
+    decoded text regularly so that output can be written as it goes.
+
+    The pieces are shifted into an integer bit buffer, which is kept short (the lookahead
+    plus one piece) so shifting it stays cheap, and the next table_bits bits index a list.
+    Codes longer than the table are matched against the codes, one length at a time.
+
+    Parameters:
+    -----------
+    pieces : Iterable[Tuple[int, int]]
+        The encoded bits as (value, number of bits) pairs, most significant bit first.
+    huffman_codes : Dict[str, str]
+        The code of each character.
+    table_bits : int
+        The number of bits looked up at once (default DECODE_TABLE_BITS).
+
+    Returns:
+    --------
+    Iterator[str]
+        The decoded text, piece by piece.
+
+    Raises:
+    -------
+    ValueError
+        If the bits do not form a sequence of complete codes.
+    """
+    table = build_decode_table(huffman_codes, table_bits)
+    codes = {(len(code), int(code, 2)): char for char, code in huffman_codes.items()}
+    max_length = max(len(code) for code in huffman_codes.values())
+    lookahead = max(table_bits, max_length)     # Bits that must be available before a lookup
+    mask = (1 << table_bits) - 1
+    buffer = buffered = 0   # The next bits, and how many there are
+    decoded = []
+    append = decoded.append
+
+    for count, (value, width) in enumerate(pieces, start=1):
+        buffer = buffer << width | value
+        buffered += width
+        while buffered >= lookahead:
+            chars, consumed = table[buffer >> (buffered - table_bits) & mask]
+            if consumed:
+                append(chars)
+                buffered -= consumed
+                continue
+
+            # Fallback for codes longer than table_bits
+            for length in range(table_bits + 1, max_length + 1):
+                char = codes.get((length, buffer >> (buffered - length) & ((1 << length) - 1)))
+                if char is not None:
+                    append(char)
+                    buffered -= length
+                    break
+            else:
+                raise ValueError("Invalid Huffman data: no code matches the input bits.")
+        buffer &= (1 << buffered) - 1   # Drop the decoded bits
+        if count % DECODE_YIELD_PIECES == 0:
+            yield "".join(decoded)
+            decoded.clear()
+
+    # Tail: fewer bits than the lookahead are left, match them code by code
+    while buffered:
+        for length in range(1, min(buffered, max_length) + 1):
+            char = codes.get((length, buffer >> (buffered - length) & ((1 << length) - 1)))
+            if char is not None:
+                append(char)
+                buffered -= length
+                break
+        else:
+            raise ValueError("Invalid Huffman data: the input ends in the middle of a code.")
+    yield "".join(decoded)
+
+
+def iter_decode_bit_strings(bit_strings: Iterable[str], huffman_codes: dict[str, str],
+                            table_bits: int = DECODE_TABLE_BITS) -> Iterator[str]:
+    """
+    Decode a stream of '0'/'1' strings with a table-driven decoder, yielding the decoded
+    text as it goes (see iter_decode_pieces).
+
+    Parameters:
+    -----------
+    bit_strings : Iterable[str]
+        The encoded bits, split into any number of chunks.
+    huffman_codes : Dict[str, str]
+        The code of each character.
+    table_bits : int
+        The number of bits looked up at once (default DECODE_TABLE_BITS).
+
+    Returns:
+    --------
+    Iterator[str]
+        The decoded text, piece by piece.
+    """
+    return iter_decode_pieces(_iter_bit_string_pieces(bit_strings), huffman_codes, table_bits)
+
+
+def decode_bit_strings(bit_strings: Iterable[str], huffman_codes: dict[str, str],
+                       table_bits: int = DECODE_TABLE_BITS) -> str:
+    """
+    Decode a stream of '0'/'1' strings with a table-driven decoder.
+
+    Parameters:
+    -----------
+    bit_strings : Iterable[str]
+        The encoded bits, split into any number of chunks.
+    huffman_codes : Dict[str, str]
+        The code of each character.
+    table_bits : int
+        The number of bits looked up at once (default DECODE_TABLE_BITS).
+
+    Returns:
+    --------
+    str
+        The decoded string.
+    """
+    return "".join(iter_decode_bit_strings(bit_strings, huffman_codes, table_bits))
+
+
+def decode_with_table(packed: bytes, bit_length: int, huffman_codes: dict[str, str],
+                      table_bits: int = DECODE_TABLE_BITS) -> str:
+    """
+    Decode packed bits (most significant bit first) with a table-driven decoder.
+
+    Parameters:
+    -----------
+    packed : bytes
+        The packed bits.
+    bit_length : int
+        The number of meaningful bits in packed.
+    huffman_codes : Dict[str, str]
+        The code of each character.
+    table_bits : int
+        The number of bits looked up at once (default DECODE_TABLE_BITS).
+
+    Returns:
+    --------
+    str
+        The decoded string.
+    """
+    chunks = (packed[start:start + UNPACK_CHUNK_SIZE] for start in range(0, len(packed), UNPACK_CHUNK_SIZE))
+    return "".join(iter_decode_pieces(_iter_packed_pieces(chunks, bit_length), huffman_codes, table_bits))
+
+
 def huffman_decoding(encoded_data: str, tree: Optional[HuffmanNode]) -> str:
     """
     Decode the given encoded data using the Huffman Tree.
@@ -186,6 +672,12 @@ def huffman_decoding(encoded_data: str, tree: Optional[HuffmanNode]) -> str:
     # Edge case: If the tree consists of only one character
     if tree.left is None and tree.right is None:
         return tree.char * len(encoded_data)  # Repeat the character for all bits
+
+    # Large inputs: pack the bits and use the table-driven decoder
+    if len(encoded_data) >= TABLE_DECODE_MIN_BITS:
+        huffman_codes = {}
+        generate_huffman_codes(tree, "", huffman_codes)
+        return decode_bit_strings([encoded_data], huffman_codes, table_bits_for(len(encoded_data)))
     
     decoded_data = ""   # Initialize decoded string
     current_node = tree # Start traversal from root
@@ -201,51 +693,1115 @@ def huffman_decoding(encoded_data: str, tree: Optional[HuffmanNode]) -> str:
     return decoded_data
 
 
-# Main Function
-if __name__ == "__main__":
+def huffman_decoding_packed(packed: bytes, bit_length: int, tree: Optional[HuffmanNode]) -> str:
+    """
+    Decode data produced by huffman_encoding_packed.
 
-    # Test Case 1: Standard test case
-    print("\nTest Case 1: Standard sentence")
-    sentence = "Huffman coding is fun!"
-    encoded_data, tree = huffman_encoding(sentence)
-    print("Encoded:", encoded_data)
-    decoded_data = huffman_decoding(encoded_data, tree)
-    print("Decoded:", decoded_data)
-    assert sentence == decoded_data
+    Parameters:
+    -----------
+    packed : bytes
+        The packed bits.
+    bit_length : int
+        The number of meaningful bits in packed (the rest is padding).
+    tree : Optional[HuffmanNode]
+        The root of the Huffman Tree used for decoding.
 
-    # Test Case 2: Single character repeated
-    print("\nTest Case 2: Single character repeated")
-    sentence = "aaaaaaa"
-    encoded_data, tree = huffman_encoding(sentence)
-    print("Encoded:", encoded_data)
-    decoded_data = huffman_decoding(encoded_data, tree)
-    print("Decoded:", decoded_data)
-    assert sentence == decoded_data
+    Returns:
+    --------
+    str
+        The decoded string.
+    """
+    if not bit_length or tree is None:  # Handle empty input cases
+        return ""
 
-    # Test Case 3: Empty string
-    print("\nTest Case 3: Empty string")
-    sentence = ""
-    encoded_data, tree = huffman_encoding(sentence)
-    print("Encoded:", encoded_data)
-    decoded_data = huffman_decoding(encoded_data, tree)
-    print("Decoded:", decoded_data)
-    assert sentence == decoded_data
+    # Edge case: If the tree consists of only one character
+    if tree.left is None and tree.right is None:
+        return tree.char * bit_length
 
-    # Test Case 4: Large input
-    print("\nTest Case 4: Large input")
-    sentence = "abcd" * 50000  # Very large input
-    encoded_data, tree = huffman_encoding(sentence)
-    print("Encoded:", encoded_data[:40],"...",encoded_data[-40:])
-    decoded_data = huffman_decoding(encoded_data, tree)
-    print("Decoded:", decoded_data[:20],"...",decoded_data[-20:])
-    assert sentence == decoded_data
-    print("Large input test passed.")
+    # Large inputs: use the table-driven decoder
+    if bit_length >= TABLE_DECODE_MIN_BITS:
+        huffman_codes = {}
+        generate_huffman_codes(tree, "", huffman_codes)
+        return decode_with_table(packed, bit_length, huffman_codes, table_bits_for(bit_length))
 
-    # Test Case 5: Null input
-    print("\nTest Case 5: Null input")
-    sentence = None
-    encoded_data, tree = huffman_encoding(sentence)
-    print("Encoded:", encoded_data)
-    decoded_data = huffman_decoding(encoded_data, tree)
-    print("Decoded:", decoded_data)
-    assert encoded_data == "" and decoded_data == ""
+    decoded_chars = []  # Collect characters in a list, joined once at the end
+    current_node = tree
+    for index in range(bit_length):
+        bit = (packed[index >> 3] >> (7 - (index & 7))) & 1
+        current_node = current_node.right if bit else current_node.left
+
+        # If a leaf node is reached, append character and restart from root
+        if current_node.char is not None:
+            decoded_chars.append(current_node.char)
+            current_node = tree
+
+    return "".join(decoded_chars)
+
+
+def code_lengths(tree: Optional[HuffmanNode]) -> dict[str, int]:
+    """
+    Return the code length of each character of a Huffman Tree (1 for a single-character tree).
+
+    Parameters:
+    -----------
+    tree : Optional[HuffmanNode]
+        The root of the Huffman Tree.
+
+    Returns:
+    --------
+    Dict[str, int]
+        A dictionary with characters as keys and their code lengths as values.
+    """
+    if tree is None:
+        return {}
+    if tree.left is None and tree.right is None:
+        return {tree.char: 1}
+    lengths = {}
+    stack = [(tree, 0)]     # Iterative DFS, deep trees must not hit the recursion limit
+    while stack:
+        node, depth = stack.pop()
+        if node.char is not None:
+            lengths[node.char] = depth
+        else:
+            stack.append((node.left, depth + 1))
+            stack.append((node.right, depth + 1))
+    return lengths
+
+
+def canonical_codes(lengths: dict[str, int]) -> dict[str, str]:
+    """
+    Assign canonical Huffman codes from the code lengths alone.
+
+    Characters are sorted by (length, character); each one gets the previous code plus one,
+    shifted left whenever the length grows. Any decoder knowing the lengths rebuilds the
+    exact same codes, so the tree itself never needs to be stored.
+
+    Parameters:
+    -----------
+    lengths : Dict[str, int]
+        The code length of each character.
+
+    Returns:
+    --------
+    Dict[str, str]
+        The canonical code of each character.
+    """
+    huffman_codes = {}
+    code = 0
+    previous_length = 0
+    for char, length in sorted(lengths.items(), key=lambda item: (item[1], item[0])):
+        code <<= length - previous_length
+        huffman_codes[char] = format(code, f"0{length}b")
+        code += 1
+        previous_length = length
+    return huffman_codes
+
+
+def limited_code_lengths(frequency: dict[str, int], max_length: int) -> dict[str, int]:
+    """
+    Compute optimal code lengths of at most max_length bits with the package-merge algorithm.
+
+    Every character is a coin of its frequency, available at each of the max_length
+    denominations. From the smallest denomination up, coins are paired into packages that
+    are merged with the next denomination's coins, and the 2 * n - 2 cheapest items of
+    the last list are kept: the code length of a character is the number of its coins in
+    them. Packages keep references to their two items, so counting costs O(n * max_length).
+
+    Parameters:
+    -----------
+    frequency : Dict[str, int]
+        The frequency of each character.
+    max_length : int
+        The maximum code length, at least ceil(log2(number of characters)).
+
+    Returns:
+    --------
+    Dict[str, int]
+        A dictionary with characters as keys and their code lengths as values.
+    """
+    if not frequency:
+        return {}
+    if len(frequency) == 1:
+        return {char: 1 for char in frequency}
+    if len(frequency) > 1 << max_length:
+        raise ValueError(f"{len(frequency)} characters cannot be coded in {max_length} bits or less.")
+
+    # Items are (weight, char, first, second): a coin has a char, a package two items
+    coins = sorted((count, char, None, None) for char, count in frequency.items())
+    items = coins
+    for _ in range(max_length - 1):
+        packages = [(first[0] + second[0], None, first, second) for first, second in zip(items[::2], items[1::2])]
+        items = list(heapq.merge(coins, packages, key=itemgetter(0)))
+
+    lengths = dict.fromkeys(frequency, 0)
+    stack = items[:2 * len(frequency) - 2]
+    while stack:
+        _, char, first, second = stack.pop()
+        if char is not None:
+            lengths[char] += 1
+        else:
+            stack.append(first)
+            stack.append(second)
+    return lengths
+
+
+def encoded_size(frequency: dict[str, int], lengths: dict[str, int]) -> int:
+    """
+    Return the number of bits needed to encode characters of the given frequencies.
+    """
+    return sum(count * lengths[char] for char, count in frequency.items())
+
+
+def length_limit_loss(frequency: dict[str, int], max_length: int) -> float:
+    """
+    Return the relative size increase caused by limiting codes to max_length bits,
+    compared to the unconstrained Huffman Tree (0.0 when the limit costs nothing).
+    """
+    optimal = encoded_size(frequency, code_lengths(build_huffman_tree(frequency)))
+    limited = encoded_size(frequency, limited_code_lengths(frequency, max_length))
+    return limited / optimal - 1 if optimal else 0.0
+
+
+HEADER_MAGIC = b"HUF\x01"
+HEADER_COUNTS = struct.Struct("<B")     # Maximum code length
+LENGTH_COUNT = struct.Struct("<I")      # Number of characters of one code length, or UTF-8 size
+
+
+def serialize_header(lengths: dict[str, int]) -> bytes:
+    """
+    Serialize code lengths into a compact header: the number of characters of each code
+    length, then the characters in canonical order as UTF-8.
+
+    Parameters:
+    -----------
+    lengths : Dict[str, int]
+        The code length of each character.
+
+    Returns:
+    --------
+    bytes
+        The header, without the magic and bit length added by huffman_compress.
+    """
+    max_length = max(lengths.values(), default=0)
+    counts = [0] * (max_length + 1)
+    for length in lengths.values():
+        counts[length] += 1
+    chars = "".join(sorted(lengths, key=lambda char: (lengths[char], char))).encode("utf-8", "surrogatepass")
+    return (HEADER_COUNTS.pack(max_length) + b"".join(LENGTH_COUNT.pack(count) for count in counts[1:]) +
+            LENGTH_COUNT.pack(len(chars)) + chars)
+
+
+def parse_header(blob: bytes, offset: int = 0) -> tuple[dict[str, int], int]:
+    """
+    Read a header written by serialize_header.
+
+    Parameters:
+    -----------
+    blob : bytes
+        The buffer holding the header.
+    offset : int
+        Where the header starts in blob (default 0).
+
+    Returns:
+    --------
+    Tuple[Dict[str, int], int]
+        The code length of each character, and the offset just after the header.
+    """
+    (max_length,) = HEADER_COUNTS.unpack_from(blob, offset)
+    offset += HEADER_COUNTS.size
+    counts = []
+    for _ in range(max_length):
+        counts.append(LENGTH_COUNT.unpack_from(blob, offset)[0])
+        offset += LENGTH_COUNT.size
+    (chars_size,) = LENGTH_COUNT.unpack_from(blob, offset)
+    offset += LENGTH_COUNT.size
+    chars = bytes(blob[offset:offset + chars_size]).decode("utf-8", "surrogatepass")
+    offset += chars_size
+
+    if len(chars) != sum(counts):
+        raise ValueError("Corrupted Huffman header: character count mismatch.")
+    lengths = {}
+    position = 0
+    for length, count in enumerate(counts, start=1):
+        for char in chars[position:position + count]:
+            lengths[char] = length
+        position += count
+    return lengths, offset
+
+
+def huffman_compress(data: str, max_length: Optional[int] = None) -> bytes:
+    """
+    Compress a string into a self-contained blob that can be stored or sent: a magic
+    number, the canonical code header, the number of encoded bits and the packed bits.
+
+    Parameters:
+    -----------
+    data : str
+        The input string to be compressed.
+    max_length : Optional[int]
+        The maximum code length, see limited_code_lengths (default None, no limit).
+
+    Returns:
+    --------
+    bytes
+        The compressed blob.
+    """
+    if data is None or not data:    # Edge case: Handle empty or None input
+        return HEADER_MAGIC + serialize_header({}) + struct.pack("<Q", 0)
+
+    frequency = calculate_frequencies(data)
+    if max_length is not None:
+        lengths = limited_code_lengths(frequency, max_length)
+    else:
+        lengths = code_lengths(build_huffman_tree(frequency))
+    packed, bit_length = pack_codes(data, canonical_codes(lengths))
+    return HEADER_MAGIC + serialize_header(lengths) + struct.pack("<Q", bit_length) + packed
+
+
+def huffman_compress_bytes(data: bytes, max_length: Optional[int] = None) -> bytes:
+    """
+    Compress bytes into a huffman_compress blob of their characters chr(0) to chr(255),
+    counting and packing them with NumPy when it is installed. Decompress the blob with
+    huffman_decompress(blob).encode("latin-1").
+
+    Parameters:
+    -----------
+    data : bytes
+        The input bytes to be compressed.
+    max_length : Optional[int]
+        The maximum code length, see limited_code_lengths (default None, no limit).
+
+    Returns:
+    --------
+    bytes
+        The compressed blob.
+    """
+    frequency = byte_frequencies(data)
+    if not frequency:
+        return huffman_compress("")
+    if max_length is not None:
+        lengths = limited_code_lengths(frequency, max_length)
+    else:
+        lengths = code_lengths(build_huffman_tree(frequency))
+    packer = BitPacker(canonical_codes(lengths))
+    packed = packer.pack_bytes(data) + packer.flush()
+    return HEADER_MAGIC + serialize_header(lengths) + struct.pack("<Q", packer.bit_length) + packed
+
+
+def huffman_decompress(blob: bytes) -> str:
+    """
+    Decompress a blob written by huffman_compress. The decoder is built straight from
+    the code lengths in the header, no Huffman Tree is rebuilt.
+
+    Parameters:
+    -----------
+    blob : bytes
+        The compressed blob.
+
+    Returns:
+    --------
+    str
+        The decompressed string.
+    """
+    if blob[:len(HEADER_MAGIC)] != HEADER_MAGIC:
+        raise ValueError("Not a Huffman blob: bad magic number.")
+    lengths, offset = parse_header(blob, len(HEADER_MAGIC))
+    (bit_length,) = struct.unpack_from("<Q", blob, offset)
+    offset += 8
+    if not bit_length:
+        return ""
+
+    table_bits = table_bits_for(bit_length, max(lengths.values()))
+    return decode_with_table(memoryview(blob)[offset:], bit_length, canonical_codes(lengths), table_bits)
+
+
+FILE_MAGIC = b"HUFS\x01"
+FILE_SIZES = struct.Struct("<QQ")   # Original size in bytes, number of encoded bits
+FILE_CHUNK_SIZE = 1 << 20           # Bytes read per step by the file codec
+
+
+def _iter_file_chunks(path: str, chunk_size: int, offset: int = 0) -> Iterator[bytes]:
+    """
+    Yield the content of a file from offset, chunk by chunk, through a memory mapping.
+    """
+    with open(path, "rb") as source:
+        if os.fstat(source.fileno()).st_size <= offset:
+            return  # mmap cannot map empty files
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for start in range(offset, len(data), chunk_size):
+                yield data[start:start + chunk_size]
+
+
+def compress_file(source_path: str, target_path: str, chunk_size: int = FILE_CHUNK_SIZE,
+                  max_length: Optional[int] = None) -> int:
+    """
+    Huffman-compress a file of any size into another, with bounded memory.
+
+    A first pass over the memory-mapped input counts the byte frequencies, then a second
+    pass encodes it chunk by chunk. Bytes are coded as the characters chr(0) to chr(255).
+
+    File format:
+    ------------
+    FILE_MAGIC, the canonical code header (see serialize_header), the original size and
+    the number of encoded bits (uint64 each), then the packed bits.
+
+    Parameters:
+    -----------
+    source_path : str
+        The file to compress.
+    target_path : str
+        The compressed file to write.
+    chunk_size : int
+        The number of bytes read per step (default FILE_CHUNK_SIZE).
+    max_length : Optional[int]
+        The maximum code length, see limited_code_lengths (default None, no limit).
+
+    Returns:
+    --------
+    int
+        The size of the compressed file in bytes.
+    """
+    frequency = Counter()
+    for chunk in _iter_file_chunks(source_path, chunk_size):
+        frequency.update(byte_frequencies(chunk))
+
+    size = sum(frequency.values())
+    if max_length is not None:
+        lengths = limited_code_lengths(frequency, max_length)
+    else:
+        lengths = code_lengths(build_huffman_tree(frequency)) if frequency else {}
+    huffman_codes = canonical_codes(lengths)
+    bit_length = encoded_size(frequency, lengths)
+
+    with open(target_path, "wb") as target:
+        target.write(FILE_MAGIC + serialize_header(lengths) + FILE_SIZES.pack(size, bit_length))
+        packer = BitPacker(huffman_codes)
+        for chunk in _iter_file_chunks(source_path, chunk_size):
+            target.write(packer.pack_bytes(chunk))
+        target.write(packer.flush())
+        return target.tell()
+
+
+def decompress_file(source_path: str, target_path: str, chunk_size: int = FILE_CHUNK_SIZE) -> int:
+    """
+    Decompress a file written by compress_file into another, with bounded memory.
+
+    Parameters:
+    -----------
+    source_path : str
+        The compressed file.
+    target_path : str
+        The file to write.
+    chunk_size : int
+        The number of compressed bytes decoded per step (default FILE_CHUNK_SIZE).
+
+    Returns:
+    --------
+    int
+        The size of the decompressed file in bytes.
+    """
+    with open(source_path, "rb") as source:
+        if source.read(len(FILE_MAGIC)) != FILE_MAGIC:
+            raise ValueError(f"'{source_path}' is not a Huffman-compressed file.")
+        with mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            lengths, offset = parse_header(data, len(FILE_MAGIC))
+            size, bit_length = FILE_SIZES.unpack_from(data, offset)
+    offset += FILE_SIZES.size
+
+    with open(target_path, "wb") as target:
+        if bit_length:
+            pieces = _iter_packed_pieces(_iter_file_chunks(source_path, chunk_size, offset), bit_length)
+            table_bits = table_bits_for(bit_length, max(lengths.values()))
+            for text in iter_decode_pieces(pieces, canonical_codes(lengths), table_bits):
+                target.write(text.encode("latin-1"))
+        written = target.tell()
+
+    if written != size:
+        raise ValueError(f"'{source_path}' is corrupted: expected {size} bytes, decoded {written}.")
+    return written
+
+
+BLOCK_MAGIC = b"HUFB\x01"
+BLOCK_SIZE = 1 << 20    # Input bytes per independent block
+BLOCK_FOOTER = struct.Struct("<IQQ")    # Block size, original size in bytes, number of blocks
+
+
+def _compress_block(block: bytes, max_length: Optional[int] = None) -> bytes:
+    """
+    Compress one block on its own, with its own code header (runs in a worker process).
+    """
+    return huffman_compress_bytes(block, max_length)
+
+
+def _decompress_block(blob: bytes) -> bytes:
+    """
+    Decompress one block written by _compress_block (runs in a worker process).
+    """
+    return huffman_decompress(blob).encode("latin-1")
+
+
+def _map_blocks(function: Callable[[bytes], bytes], blocks: Iterable[bytes], workers: int) -> Iterator[bytes]:
+    """
+    Apply function to every block in a pool of processes, yielding the results in order.
+
+    At most 2 * workers blocks are in flight, so memory stays bounded on large inputs
+    (Executor.map would submit the whole iterable at once).
+    """
+    if workers <= 1:
+        yield from map(function, blocks)    # No pool overhead for a single worker
+        return
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for block in blocks:
+            pending.append(executor.submit(function, block))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _write_blocks(target: BinaryIO, blocks: Iterable[bytes], size: int, block_size: int, workers: int,
+                  max_length: Optional[int]) -> int:
+    """
+    Compress blocks into a block archive written to target, return the archive size.
+    """
+    offsets = []
+    position = target.write(BLOCK_MAGIC)
+    for blob in _map_blocks(partial(_compress_block, max_length=max_length), blocks, workers):
+        position += target.write(blob)
+        offsets.append(position)
+    position += target.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+    position += target.write(BLOCK_FOOTER.pack(block_size, size, len(offsets)))
+    return position
+
+
+def compress_blocks(data: bytes, block_size: int = BLOCK_SIZE, workers: int = 1,
+                    max_length: Optional[int] = None) -> bytes:
+    """
+    Compress data as independent blocks, encoded in parallel, into a block archive.
+
+    Archive format:
+    ---------------
+    BLOCK_MAGIC, the blocks (each a huffman_compress blob of block_size input bytes, the
+    last one shorter), the end offset of every block (uint64 each), then BLOCK_FOOTER.
+    The index sits at the end so archives can be written in one pass.
+
+    Parameters:
+    -----------
+    data : bytes
+        The input to be compressed.
+    block_size : int
+        The number of input bytes per block (default BLOCK_SIZE).
+    workers : int
+        The number of worker processes (default 1, no pool).
+    max_length : Optional[int]
+        The maximum code length, see limited_code_lengths (default None, no limit).
+
+    Returns:
+    --------
+    bytes
+        The block archive.
+    """
+    blocks = (bytes(data[start:start + block_size]) for start in range(0, len(data), block_size))
+    archive = io.BytesIO()
+    _write_blocks(archive, blocks, len(data), block_size, workers, max_length)
+    return archive.getvalue()
+
+
+def compress_file_blocks(source_path: str, target_path: str, block_size: int = BLOCK_SIZE,
+                         workers: int = 1, max_length: Optional[int] = None) -> int:
+    """
+    Compress a file into a block archive (see compress_blocks), reading it through a memory
+    mapping with at most 2 * workers blocks in memory.
+
+    Returns:
+    --------
+    int
+        The size of the archive in bytes.
+    """
+    size = os.path.getsize(source_path)
+    with open(target_path, "wb") as target:
+        return _write_blocks(target, _iter_file_chunks(source_path, block_size), size, block_size, workers,
+                             max_length)
+
+
+class BlockArchive:
+    """
+    Random access to a block archive written by compress_blocks or compress_file_blocks.
+
+    Any block is decoded on its own, so reading a slice only decodes the blocks it spans.
+
+    Attributes:
+    -----------
+    buffer : bytes
+        The archive, or any buffer over it such as a memory-mapped file.
+    block_size : int
+        The number of input bytes per block.
+    size : int
+        The size of the original data in bytes.
+    offsets : List[int]
+        The offset where each block starts, followed by the offset where the last one ends.
+    """
+
+    def __init__(self, buffer: bytes) -> None:
+        """
+        Constructs all the necessary attributes for the BlockArchive object.
+
+        Parameters:
+        -----------
+        buffer : bytes
+            The archive, or any buffer over it such as a memory-mapped file.
+        """
+        if len(buffer) < len(BLOCK_MAGIC) + BLOCK_FOOTER.size or buffer[:len(BLOCK_MAGIC)] != BLOCK_MAGIC:
+            raise ValueError("Not a Huffman block archive: bad magic number.")
+        self.buffer = buffer
+        self.block_size, self.size, num_blocks = BLOCK_FOOTER.unpack_from(buffer, len(buffer) - BLOCK_FOOTER.size)
+        index_offset = len(buffer) - BLOCK_FOOTER.size - 8 * num_blocks
+        self.offsets = [len(BLOCK_MAGIC), *struct.unpack_from(f"<{num_blocks}Q", buffer, index_offset)]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def block(self, index: int) -> bytes:
+        """
+        Decode the block at index.
+        """
+        return _decompress_block(bytes(self.buffer[self.offsets[index]:self.offsets[index + 1]]))
+
+    def read(self, start: int, size: int) -> bytes:
+        """
+        Return size bytes of the original data from start, decoding only the blocks they span.
+        """
+        end = min(start + size, self.size)
+        if start >= end:
+            return b""
+        first, last = start // self.block_size, (end - 1) // self.block_size
+        data = b"".join(self.block(index) for index in range(first, last + 1))
+        return data[start - first * self.block_size:end - first * self.block_size]
+
+    def iter_blocks(self, workers: int = 1) -> Iterator[bytes]:
+        """
+        Decode every block in order, in a pool of worker processes if workers > 1.
+        """
+        blobs = (bytes(self.buffer[self.offsets[index]:self.offsets[index + 1]]) for index in range(len(self)))
+        return _map_blocks(_decompress_block, blobs, workers)
+
+
+def decompress_blocks(archive: bytes, workers: int = 1) -> bytes:
+    """
+    Decompress a whole block archive, decoding the blocks in parallel if workers > 1.
+
+    Parameters:
+    -----------
+    archive : bytes
+        The block archive.
+    workers : int
+        The number of worker processes (default 1, no pool).
+
+    Returns:
+    --------
+    bytes
+        The original data.
+    """
+    return b"".join(BlockArchive(archive).iter_blocks(workers))
+
+
+ADAPTIVE_END_OF_STREAM = 0xFF   # Never the first byte of a UTF-8 character
+
+
+class AdaptiveHuffmanNode(HuffmanNode):
+    """
+    A node of an adaptive Huffman Tree, which also knows its parent and its position in
+    the node list of the tree.
+
+    Attributes:
+    -----------
+    parent : Optional[AdaptiveHuffmanNode]
+        The parent node, None for the root.
+    index : int
+        The position of the node in AdaptiveHuffmanTree.nodes.
+    """
+
+    def __init__(self, char: Optional[str], freq: int, parent: Optional['AdaptiveHuffmanNode'], index: int) -> None:
+        """
+        Constructs all the necessary attributes for the AdaptiveHuffmanNode object.
+
+        Parameters:
+        -----------
+        char : Optional[str]
+            The character stored in the node, None for internal nodes and the NYT node.
+        freq : int
+            The number of occurrences seen so far.
+        parent : Optional[AdaptiveHuffmanNode]
+            The parent node, None for the root.
+        index : int
+            The position of the node in AdaptiveHuffmanTree.nodes.
+        """
+        super().__init__(char, freq)
+        self.parent = parent
+        self.index = index
+
+
+class AdaptiveHuffmanTree:
+    """
+    The Huffman Tree shared by the adaptive encoder and decoder (FGK algorithm), updated
+    after every character so that both sides stay in sync without any header.
+
+    It starts with a single NYT ("not yet transmitted") leaf. A new character is sent as
+    the NYT code followed by its UTF-8 bytes, and the NYT leaf splits into a new NYT and
+    the character's leaf. The nodes are listed with non-increasing frequencies, siblings
+    side by side (the sibling property), so the tree stays a Huffman Tree: when a node
+    is incremented, it is first swapped with the first node of the same frequency.
+
+    Attributes:
+    -----------
+    root : AdaptiveHuffmanNode
+        The root of the tree.
+    nyt : AdaptiveHuffmanNode
+        The leaf standing for the characters not seen yet.
+    nodes : List[AdaptiveHuffmanNode]
+        All the nodes, the root first, by non-increasing frequency.
+    leaves : Dict[str, AdaptiveHuffmanNode]
+        The leaf of each character seen so far.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructs all the necessary attributes for the AdaptiveHuffmanTree object.
+        """
+        self.nyt = AdaptiveHuffmanNode(None, 0, None, 0)
+        self.root = self.nyt
+        self.nodes = [self.nyt]
+        self.leaves = {}
+
+    def code(self, node: AdaptiveHuffmanNode) -> str:
+        """
+        Return the current code of a node, the path from the root ('0' left, '1' right).
+        """
+        bits = []
+        while node.parent is not None:
+            bits.append("0" if node.parent.left is node else "1")
+            node = node.parent
+        return "".join(reversed(bits))
+
+    def _swap(self, node: AdaptiveHuffmanNode, other: AdaptiveHuffmanNode) -> None:
+        """
+        Swap two nodes, with their subtrees, in the tree and in the node list.
+        """
+        self.nodes[node.index], self.nodes[other.index] = other, node
+        node.index, other.index = other.index, node.index
+        parent, other_parent = node.parent, other.parent
+        if parent is other_parent:
+            parent.left, parent.right = parent.right, parent.left
+            return
+        if parent.left is node:
+            parent.left = other
+        else:
+            parent.right = other
+        if other_parent.left is other:
+            other_parent.left = node
+        else:
+            other_parent.right = node
+        node.parent, other.parent = other_parent, parent
+
+    def update(self, char: str) -> None:
+        """
+        Count one more occurrence of char, restoring the sibling property on the way up.
+
+        Costs O(depth) swaps, plus the scan for the first node of each frequency, which is
+        bounded by the number of nodes of that frequency.
+        """
+        node = self.leaves.get(char)
+        if node is None:
+            # The NYT leaf becomes an internal node: new NYT on the left, char on the right
+            parent = self.nyt
+            node = AdaptiveHuffmanNode(char, 0, parent, len(self.nodes))
+            self.nyt = AdaptiveHuffmanNode(None, 0, parent, len(self.nodes) + 1)
+            parent.left, parent.right = self.nyt, node
+            self.nodes += [node, self.nyt]
+            self.leaves[char] = node
+
+        nodes = self.nodes
+        while node is not None:
+            leader = node.index
+            while leader > 0 and nodes[leader - 1].freq == node.freq:
+                leader -= 1
+            if nodes[leader] is not node and nodes[leader] is not node.parent:
+                self._swap(node, nodes[leader])
+            node.freq += 1
+            node = node.parent
+
+
+class AdaptiveHuffmanEncoder(AdaptiveHuffmanTree):
+    """
+    Single-pass Huffman encoder: every character is coded with the current tree, then
+    the tree is updated. Output is returned as soon as it fills whole bytes.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructs all the necessary attributes for the AdaptiveHuffmanEncoder object.
+        """
+        super().__init__()
+        self.carry = ""     # Bits left over from the previous call, fewer than 8
+
+    def _whole_bytes(self, bits: str) -> bytes:
+        """
+        Return the whole bytes of carry + bits, and keep the remaining bits as the carry.
+        """
+        bits = self.carry + bits
+        whole = len(bits) - len(bits) % 8
+        self.carry = bits[whole:]
+        return int(bits[:whole], 2).to_bytes(whole // 8, "big") if whole else b""
+
+    def encode(self, data: str) -> bytes:
+        """
+        Encode the next part of the stream.
+
+        Parameters:
+        -----------
+        data : str
+            The characters to encode.
+
+        Returns:
+        --------
+        bytes
+            The encoded bytes completed so far (up to 7 bits wait for the next call).
+        """
+        bits = []
+        for char in data:
+            leaf = self.leaves.get(char)
+            if leaf is None:
+                bits.append(self.code(self.nyt))
+                bits.extend(format(byte, "08b") for byte in char.encode("utf-8", "surrogatepass"))
+            else:
+                bits.append(self.code(leaf))
+            self.update(char)
+        return self._whole_bytes("".join(bits))
+
+    def flush(self) -> bytes:
+        """
+        End the stream: write the end-of-stream marker and pad the last byte.
+        """
+        return self._whole_bytes(self.code(self.nyt) + format(ADAPTIVE_END_OF_STREAM, "08b") + "0" * 7)
+
+
+class AdaptiveHuffmanDecoder(AdaptiveHuffmanTree):
+    """
+    Single-pass Huffman decoder for the output of AdaptiveHuffmanEncoder, which can be fed
+    any slicing of the stream and returns each character as soon as its last bit arrives.
+
+    Attributes:
+    -----------
+    finished : bool
+        True once the end-of-stream marker has been read; later input is ignored.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructs all the necessary attributes for the AdaptiveHuffmanDecoder object.
+        """
+        super().__init__()
+        self.node = self.root
+        self.raw = ""       # Bits of a new character being read, None while walking the tree
+        self.finished = False
+
+    def decode(self, data: bytes) -> str:
+        """
+        Decode the next part of the stream.
+
+        Parameters:
+        -----------
+        data : bytes
+            The next encoded bytes.
+
+        Returns:
+        --------
+        str
+            The characters completed by these bytes.
+        """
+        decoded = []
+        bits = format(int.from_bytes(data, "big"), f"0{len(data) * 8}b") if data else ""
+        for bit in bits:
+            if self.finished:
+                break
+            if self.raw is None:
+                self.node = self.node.right if bit == "1" else self.node.left
+                if self.node is self.nyt:
+                    self.raw = ""
+                elif self.node.char is not None:
+                    self._emit(self.node.char, decoded)
+                continue
+
+            self.raw += bit
+            if len(self.raw) % 8:
+                continue
+            raw = int(self.raw, 2).to_bytes(len(self.raw) // 8, "big")
+            if raw[0] == ADAPTIVE_END_OF_STREAM:
+                self.finished = True
+            elif len(raw) == (1 if raw[0] < 0x80 else 2 if raw[0] < 0xE0 else 3 if raw[0] < 0xF0 else 4):
+                self._emit(raw.decode("utf-8", "surrogatepass"), decoded)
+        return "".join(decoded)
+
+    def _emit(self, char: str, decoded: list[str]) -> None:
+        """
+        Output a decoded character, update the tree and go back to the root.
+        """
+        decoded.append(char)
+        self.update(char)
+        self.node = self.root
+        self.raw = None
+
+
+def adaptive_huffman_encoding(data: str) -> bytes:
+    """
+    Encode a whole string with adaptive Huffman coding: one pass, no header.
+
+    Parameters:
+    -----------
+    data : str
+        The input string to be encoded.
+
+    Returns:
+    --------
+    bytes
+        The encoded stream, ended by a marker.
+    """
+    encoder = AdaptiveHuffmanEncoder()
+    return encoder.encode(data) + encoder.flush()
+
+
+def adaptive_huffman_decoding(encoded_data: bytes) -> str:
+    """
+    Decode a whole stream written by adaptive_huffman_encoding.
+
+    Parameters:
+    -----------
+    encoded_data : bytes
+        The encoded stream.
+
+    Returns:
+    --------
+    str
+        The decoded string.
+    """
+    decoder = AdaptiveHuffmanDecoder()
+    decoded = decoder.decode(encoded_data)
+    if not decoder.finished:
+        raise ValueError("Truncated adaptive Huffman stream: no end-of-stream marker.")
+    return decoded
+
+
+# Main Function
+if __name__ == "__main__":
+
+    # Test Case 1: Standard test case
+    print("\nTest Case 1: Standard sentence")
+    sentence = "Huffman coding is fun!"
+    encoded_data, tree = huffman_encoding(sentence)
+    print("Encoded:", encoded_data)
+    decoded_data = huffman_decoding(encoded_data, tree)
+    print("Decoded:", decoded_data)
+    assert sentence == decoded_data
+
+    # Test Case 2: Single character repeated
+    print("\nTest Case 2: Single character repeated")
+    sentence = "aaaaaaa"
+    encoded_data, tree = huffman_encoding(sentence)
+    print("Encoded:", encoded_data)
+    decoded_data = huffman_decoding(encoded_data, tree)
+    print("Decoded:", decoded_data)
+    assert sentence == decoded_data
+
+    # Test Case 3: Empty string
+    print("\nTest Case 3: Empty string")
+    sentence = ""
+    encoded_data, tree = huffman_encoding(sentence)
+    print("Encoded:", encoded_data)
+    decoded_data = huffman_decoding(encoded_data, tree)
+    print("Decoded:", decoded_data)
+    assert sentence == decoded_data
+
+    # Test Case 4: Large input
+    print("\nTest Case 4: Large input")
+    sentence = "abcd" * 50000  # Very large input
+    encoded_data, tree = huffman_encoding(sentence)
+    print("Encoded:", encoded_data[:40],"...",encoded_data[-40:])
+    decoded_data = huffman_decoding(encoded_data, tree)
+    print("Decoded:", decoded_data[:20],"...",decoded_data[-20:])
+    assert sentence == decoded_data
+    print("Large input test passed.")
+
+    # Test Case 5: Null input
+    print("\nTest Case 5: Null input")
+    sentence = None
+    encoded_data, tree = huffman_encoding(sentence)
+    print("Encoded:", encoded_data)
+    decoded_data = huffman_decoding(encoded_data, tree)
+    print("Decoded:", decoded_data)
+    assert encoded_data == "" and decoded_data == ""
+
+    # Test Case 6: Bit-packed binary mode
+    print("\nTest Case 6: Bit-packed binary mode")
+    for sentence in ("Huffman coding is fun!", "aaaaaaa", "abcd" * 50000, "x" * 9, "ab" * 3):
+        packed, bit_length, tree = huffman_encoding_packed(sentence)
+        encoded_data, _ = huffman_encoding(sentence)
+        assert bit_length == len(encoded_data) and len(packed) == (bit_length + 7) // 8
+        assert huffman_decoding_packed(packed, bit_length, tree) == sentence
+    sentence = "abcd" * 50000
+    packed, bit_length, tree = huffman_encoding_packed(sentence)
+    print("Packed size:", len(packed), "bytes for", len(sentence), "characters")
+    assert len(packed) == len(sentence) // 4    # 2 bits per character
+    assert huffman_encoding_packed("") == (b"", 0, None) and huffman_decoding_packed(b"", 0, None) == ""
+
+    # Test Case 7: Table-driven decoder, including codes longer than the table
+    print("\nTest Case 7: Table-driven decoder")
+    fibonacci = [1, 1]
+    while len(fibonacci) < 20:
+        fibonacci.append(fibonacci[-1] + fibonacci[-2])
+    sentence = "".join(chr(65 + i) * count for i, count in enumerate(fibonacci))   # Codes up to 19 bits
+    sentence = sentence[::2] + sentence[1::2]
+    for sample in (sentence, "Huffman coding is fun!" * 3000, "abcd" * 50000):
+        packed, bit_length, tree = huffman_encoding_packed(sample)
+        huffman_codes = {}
+        generate_huffman_codes(tree, "", huffman_codes)
+        if sample is sentence:
+            assert max(len(code) for code in huffman_codes.values()) > 12
+        for table_bits in (4, 12):
+            assert decode_with_table(packed, bit_length, huffman_codes, table_bits) == sample
+        encoded_data, tree = huffman_encoding(sample)
+        assert huffman_decoding(encoded_data, tree) == sample
+
+    # Test Case 8: Canonical codes and self-contained compressed blobs
+    print("\nTest Case 8: Canonical codes with a compact header")
+    for sentence in ("Huffman coding is fun!", "aaaaaaa", "", "abcd" * 50000, sentence, "Ünïcödé ✓ \U0001F600" * 100):
+        blob = huffman_compress(sentence)
+        assert huffman_decompress(blob) == sentence
+        if sentence:
+            _, tree = huffman_encoding(sentence)
+            lengths = code_lengths(tree)
+            huffman_codes = canonical_codes(lengths)
+            assert {char: len(code) for char, code in huffman_codes.items()} == lengths
+            assert all(not b.startswith(a) for a in huffman_codes.values() for b in huffman_codes.values() if a != b)
+    assert canonical_codes({"a": 1, "b": 2, "c": 3, "d": 3}) == {"a": "0", "b": "10", "c": "110", "d": "111"}
+    blob = huffman_compress("Huffman coding is fun!")
+    print("Blob size:", len(blob), "bytes for 22 characters")
+    assert len(blob) < 3 * 22
+
+    # Test Case 9: Streaming file compression with bounded chunks
+    print("\nTest Case 9: Streaming file codec")
+    import random
+    import tempfile
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        samples = {
+            "log": b"".join(b"2024-01-01 INFO request %d served in %d ms\n" % (i, i % 97) for i in range(20000)),
+            "binary": bytes(random.Random(0).choice(b"\x00\x01\x02\xff") for _ in range(50000)),
+            "single": b"z" * 1000,
+            "empty": b"",
+        }
+        for name, content in samples.items():
+            source = os.path.join(temporary_dir, name)
+            compressed = source + ".huf"
+            restored = source + ".out"
+            with open(source, "wb") as source_file:
+                source_file.write(content)
+            compressed_size = compress_file(source, compressed, chunk_size=4096)
+            assert decompress_file(compressed, restored, chunk_size=1000) == len(content)
+            with open(restored, "rb") as restored_file:
+                assert restored_file.read() == content
+            if name == "log":
+                print("Log compressed from", len(content), "to", compressed_size, "bytes")
+                assert compressed_size < 0.7 * len(content)
+
+    # Test Case 10: Parallel block archive with random access
+    print("\nTest Case 10: Block archive")
+    content = samples["log"]
+    archive = compress_blocks(content, block_size=65536, workers=2)
+    assert archive == compress_blocks(content, block_size=65536)   # Blocks do not depend on the pool
+    assert decompress_blocks(archive, workers=2) == content
+    blocks = BlockArchive(archive)
+    print("Archive of", len(blocks), "blocks,", len(archive), "bytes")
+    assert len(blocks) == -(-len(content) // 65536)
+    assert blocks.read(100000, 50000) == content[100000:150000]    # Spans two blocks
+    assert blocks.read(len(content) - 10, 100) == content[-10:]
+    assert blocks.read(len(content), 10) == b""
+    assert decompress_blocks(compress_blocks(b"")) == b""
+    assert decompress_blocks(compress_blocks(content, 65536, workers=2, max_length=9), workers=2) == content
+
+    # Test Case 11: Length-limited codes with package-merge
+    print("\nTest Case 11: Length-limited codes")
+    sentence = "".join(chr(65 + i) * count for i, count in enumerate(fibonacci))
+    frequency = calculate_frequencies(sentence)
+    assert max(code_lengths(build_huffman_tree(frequency)).values()) == 19
+    for max_length in (5, 8, 12, 19, 30):
+        lengths = limited_code_lengths(frequency, max_length)
+        assert max(lengths.values()) == min(max_length, 19)
+        assert sum(2 ** -length for length in lengths.values()) == 1     # A complete prefix code
+        assert huffman_decompress(huffman_compress(sentence, max_length)) == sentence
+    print("Compression loss with codes of at most 8 bits:", f"{length_limit_loss(frequency, 8):.3%}")
+    assert 0 < length_limit_loss(frequency, 8) < 0.01
+    assert length_limit_loss(frequency, 19) == 0.0
+    assert limited_code_lengths(calculate_frequencies("aaaa"), 1) == {"a": 1}
+    try:
+        limited_code_lengths(frequency, 4)  # 20 characters need at least 5 bits
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+
+    # Test Case 12: Bytes fast path, vectorized when NumPy is installed
+    print("\nTest Case 12: Bytes fast path", "(NumPy)" if np is not None else "(pure Python fallback)")
+    for content in (samples["log"], samples["binary"], bytes(range(256)) * 40, b"q" * 999, b"xy", b"x", b""):
+        frequency = byte_frequencies(content)
+        assert frequency == calculate_frequencies(content.decode("latin-1"))
+        blob = huffman_compress_bytes(content)
+        assert huffman_decompress(blob).encode("latin-1") == content
+        if content:
+            huffman_codes = canonical_codes(code_lengths(build_huffman_tree(frequency)))
+            packer = BitPacker(huffman_codes)
+            # Uneven pieces exercise the carried bits and the odd trailing byte
+            pieces = [packer.pack_bytes(content[start:start + 777]) for start in range(0, len(content), 777)]
+            packed = b"".join(pieces) + packer.flush()
+            assert (packed, packer.bit_length) == pack_codes(content.decode("latin-1"), huffman_codes)
+
+    # Test Case 13: Adaptive Huffman coding, single pass and no header
+    print("\nTest Case 13: Adaptive Huffman coding")
+    text = samples["log"][:100000].decode("latin-1")
+    for sentence in ("Huffman coding is fun!", "aaaaaaa", "a", "", "Ünïcödé ✓ \U0001F600" * 50, text, sentence):
+        encoded = adaptive_huffman_encoding(sentence)
+        assert adaptive_huffman_decoding(encoded) == sentence
+    encoder = AdaptiveHuffmanEncoder()
+    encoded = encoder.encode(text)
+    assert all(earlier.freq >= later.freq for earlier, later in zip(encoder.nodes, encoder.nodes[1:]))
+    static_size = len(huffman_compress(text))
+    print("Adaptive:", len(encoded), "bytes, static with header:", static_size, "bytes")
+    assert len(encoded) < 1.02 * static_size
+    # Live stream: every chunk decodes as soon as it is sent, except at most 7 pending bits
+    encoder, decoder = AdaptiveHuffmanEncoder(), AdaptiveHuffmanDecoder()
+    received = ""
+    for start in range(0, 2000, 7):
+        received += decoder.decode(encoder.encode(text[start:start + 7]))
+        assert text[:start + 7].startswith(received) and start + 7 - len(received) <= 7
+    received += decoder.decode(encoder.flush())
+    assert received == text[:2002] and decoder.finished
+    try:
+        adaptive_huffman_decoding(adaptive_huffman_encoding("abc")[:-1])
+        assert False, "Expected ValueError"
+    except ValueError:
+        pass
+
+    # Test Case 14: Corrupt input raises ValueError instead of hanging
+    print("\nTest Case 14: Invalid encoded data")
+    incomplete_codes = {"a": "0", "b": "10", "c": "1100"}  # Prefix 111 and 1101 decode nothing
+    for bits in ("0" * 64 + "111" + "0" * 64, "0" * 64 + "11"):
+        try:
+            decode_bit_strings([bits], incomplete_codes, table_bits=2)
+            assert False, "Expected ValueError"
+        except ValueError:
+            pass
+
+    # Test Case 15: Decode tables are only widened for inputs long enough to repay them
+    print("\nTest Case 15: Decode table width")
+    assert table_bits_for(3000) == table_bits_for(3000, 14) == 8
+    assert table_bits_for(1 << 18, 14) == 14 and table_bits_for(1 << 18, 20) == table_bits_for(1 << 18) == 11
+    skewed = "".join(chr(65 + i) * count for i, count in enumerate(fibonacci[:15]))[:300]
+    assert huffman_decompress(huffman_compress(skewed, max_length=14)) == skewed